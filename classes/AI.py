@@ -1,697 +1,158 @@
 
 from utils.constante import *
+from utils.bitboard import *
+from classes.position import *
+from utils.rules import *
+from classes.transposition import *
+from utils.moves import *
+from utils.pst import *
 import random
+import time
 
-# --- POSITIONAL EVALUATION TABLES (PST) ---
-# These tables define where pieces prefer to be (from WHITE's perspective).
-# The Y index is inverted for Black.
-# Values are small to avoid exceeding the value of a pawn (often 10 or 100).
-
-# Pawns want to advance (Y=0 is the top of the screen, promotion for White)
-PAWN_TABLE = [
-    [0,  0,  0,  0,  0,  0,  0,  0],
-    [50, 50, 50, 50, 50, 50, 50, 50],
-    [10, 10, 20, 30, 30, 20, 10, 10],
-    [5,  5, 10, 25, 25, 10,  5,  5],
-    [0,  0,  0, 20, 20,  0,  0,  0],
-    [5, -5,-10,  0,  0,-10, -5,  5],
-    [5, 10, 10,-20,-20, 10, 10,  5],
-    [0,  0,  0,  0,  0,  0,  0,  0]
-]
-
-KNIGHT_TABLE = [
-    [-50,-40,-30,-30,-30,-30,-40,-50],
-    [-40,-20,  0,  0,  0,  0,-20,-40],
-    [-30,  0, 10, 15, 15, 10,  0,-30],
-    [-30,  5, 15, 20, 20, 15,  5,-30],
-    [-30,  0, 15, 20, 20, 15,  0,-30],
-    [-30,  5, 10, 15, 15, 10,  5,-30],
-    [-40,-20,  0,  5,  5,  0,-20,-40],
-    [-50,-40,-30,-30,-30,-30,-40,-50]
-]
-
-BISHOP_TABLE = [
-    [-20,-10,-10,-10,-10,-10,-10,-20],
-    [-10,  0,  0,  0,  0,  0,  0,-10],
-    [-10,  0,  5, 10, 10,  5,  0,-10],
-    [-10,  5,  5, 10, 10,  5,  5,-10],
-    [-10,  0, 10, 10, 10, 10,  0,-10],
-    [-10, 10, 10, 10, 10, 10, 10,-10],
-    [-10,  5,  0,  0,  0,  0,  5,-10],
-    [-20,-10,-10,-10,-10,-10,-10,-20]
-]
-
-ROOK_TABLE = [
-    [0,  0,  0,  0,  0,  0,  0,  0],
-    [5, 10, 10, 10, 10, 10, 10,  5],
-    [-5,  0,  0,  0,  0,  0,  0, -5],
-    [-5,  0,  0,  0,  0,  0,  0, -5],
-    [-5,  0,  0,  0,  0,  0,  0, -5],
-    [-5,  0,  0,  0,  0,  0,  0, -5],
-    [-5,  0,  0,  0,  0,  0,  0, -5],
-    [0,  0,  0,  5,  5,  0,  0,  0]
-]
-
-QUEEN_TABLE = [
-    [-20,-10,-10, -5, -5,-10,-10,-20],
-    [-10,  0,  0,  0,  0,  0,  0,-10],
-    [-10,  0,  5,  5,  5,  5,  0,-10],
-    [-5,  0,  5,  5,  5,  5,  0, -5],
-    [0,  0,  5,  5,  5,  5,  0, -5],
-    [-10,  5,  5,  5,  5,  5,  0,-10],
-    [-10,  0,  5,  0,  0,  0,  0,-10],
-    [-20,-10,-10, -5, -5,-10,-10,-20]
-]
-
-KING_MIDDLE_GAME_TABLE = [
-    [-30,-40,-40,-50,-50,-40,-40,-30],
-    [-30,-40,-40,-50,-50,-40,-40,-30],
-    [-30,-40,-40,-50,-50,-40,-40,-30],
-    [-30,-40,-40,-50,-50,-40,-40,-30],
-    [-20,-30,-30,-40,-40,-30,-30,-20],
-    [-10,-20,-20,-20,-20,-20,-20,-10],
-    [20, 20,  0,  0,  0,  0, 20, 20],
-    [20, 30, 10,  0,  0, 10, 30, 20]
-]
-
-KING_END_GAME_TABLE = [
-    [-50,-40,-30,-20,-20,-30,-40,-50],
-    [-30,-20,-10,  0,  0,-10,-20,-30],
-    [-30,-10, 20, 30, 30, 20,-10,-30],
-    [-30,-10, 30, 40, 40, 30,-10,-30],
-    [-30,-10, 30, 40, 40, 30,-10,-30],
-    [-30,-10, 20, 30, 30, 20,-10,-30],
-    [-30,-30,  0,  0,  0,  0,-30,-30],
-    [-50,-30,-30,-30,-30,-30,-30,-50]
-]
-
-def is_collinear(v1, v2):
-    """
-    Check if two vectors are collinear (parallel or anti-parallel).
-
-    Args:
-        v1 (tuple): First vector (dx, dy)
-        v2 (tuple): Second vector (dx, dy)
-
-    Returns:
-        bool: True if vectors are collinear, False otherwise
-    """
-    # Cross product is zero for collinear vectors
-    return v1[0] * v2[1] - v1[1] * v2[0] == 0
+# Rank of the attacker in the MVV-LVA ordering, the cheapest attacker captures first
+ATTACKER_RANK = {PAWN: 0, KNIGHT: 1, BISHOP: 2, ROOK: 3, QUEEN: 4, KING: 5}
 
 
-def is_legal_move_simu(state, o_x, o_y, d_x, d_y):
+def capture_gain(state, move):
     """
-    Check if a move is legal in a simulated board state (used for move validation).
-
-    Args:
-        board (list): 2D list representing the board state
-        o_x (int): Origin x coordinate
-        o_y (int): Origin y coordinate
-        d_x (int): Destination x coordinate
-        d_y (int): Destination y coordinate
-
-    Returns:
-        bool: True if the move is legal, False otherwise
+    Material won by a capture or a promotion, used by the delta pruning.
     """
-    board = state['board']
-    case_sta = board[o_y][o_x]
-    case_end = board[d_y][d_x]
-    distance_x = d_x - o_x
-    distance_y = d_y - o_y
-    valid_direction = False
-
-    if case_sta[PIECE_TYPE] == KING:
-        if (distance_x,distance_y) not in KING_DIRECTION:
-            if (case_sta[PIECE_COLOR] == WHITE and (d_x, d_y) == QUEEN_SIDE_CASTLE[1]) or (case_sta[PIECE_COLOR] == BLACK and (d_x, d_y) == QUEEN_SIDE_CASTLE[0])  and case_sta[PIECE_NB_MOVEMENT] == 0:
-                    return can_castle_queen_side_simu(state, case_sta[PIECE_COLOR])
-            elif (case_sta[PIECE_COLOR] == WHITE and (d_x, d_y) == KING_SIDE_CASTLE[1]) or (case_sta[PIECE_COLOR] == BLACK and (d_x, d_y) == KING_SIDE_CASTLE[0]) and case_sta[PIECE_NB_MOVEMENT] == 0:
-                    return can_castle_king_side_simu(state, case_sta[PIECE_COLOR])
-
-    # Handle non-pawn pieces
-    if case_sta[0] != PAWN:
-        if case_sta[2] == SLIDING:
-            # Check if move direction is valid for sliding pieces
-            for direct in MOVEMENT[case_sta[0]]:
-                if is_collinear((distance_x, distance_y), direct):
-                    valid_direction = True
-                    break
-
-            # Check if path is clear
-            if valid_direction:
-                step_x = (distance_x // abs(distance_x)) if distance_x != 0 else 0
-                step_y = (distance_y // abs(distance_y)) if distance_y != 0 else 0
-                x, y = o_x + step_x, o_y + step_y
-                while (x, y) != (d_x, d_y):
-                    if board[y][x] is not None:
-                        return False
-                    x += step_x
-                    y += step_y
-        else:
-            # For non-sliding pieces
-            valid_direction = (distance_x, distance_y) in MOVEMENT[case_sta[0]]
-
-        # Check destination
-        if case_end is None:
-            return valid_direction
-
-        # Cannot capture own piece
-        if case_sta[1] == case_end[1]:
-            return False
-        elif valid_direction:
-            return True
+    if move & CAPTURE_FLAG:
+        gain = PIECE_VALUE[abs(state.squares[(move >> MOVE_TO_SHIFT) & MOVE_SQUARE_MASK])]
+    elif move & EN_PASSANT_FLAG:
+        gain = PIECE_VALUE[PAWN]
     else:
-        # Handle pawn moves
-        return is_legal_move_pawn_simu(state, o_x, o_y, d_x, d_y)
+        gain = 0
+    promotion = (move >> MOVE_PROMOTION_SHIFT) & MOVE_PROMOTION_MASK
+    if promotion:
+        gain += PIECE_VALUE[promotion] - PIECE_VALUE[PAWN]
+    return gain
 
 
-def is_legal_move_pawn_simu(state, o_x, o_y, d_x, d_y):
+def score_move(state, move : int ) -> int :
     """
-    Check if a pawn move is legal in a simulated board state.
-
-    Args:
-        state (dict): A dictionary representing the state of the board and various information about the move.
-        o_x (int): Origin x coordinate
-        o_y (int): Origin y coordinate
-        d_x (int): Destination x coordinate
-        d_y (int): Destination y coordinate
-
-    Returns:
-        bool: True if the pawn move is legal, False otherwise
+    MVV-LVA score of a move: the most valuable victim first, taken by the least valuable attacker.
+    Quiet moves score 0, promotions count as winning the difference with a queen.
     """
-    board = state['board']
-    original = board[o_y][o_x]
-    destination = board[d_y][d_x]
-    color = original[1]
-
-    # Calculate movement vector
-    distance_x = d_x - o_x
-    distance_y = d_y - o_y
-
-    #Check is en passant is possible
-    if can_en_passant_simu(state,o_x, o_y, d_x, d_y):
-        return True
-
-
-    # Check diagonal capture moves based on color
-    if color == WHITE:
-        if (distance_x, distance_y) in DIRECTIONS_WHITE_PAWN_2 and destination is not None and destination[PIECE_COLOR] == BLACK:
-            return True
-        # Check forward moves
-        if original[PIECE_NB_MOVEMENT] == 0:  # Pawn hasn't moved
-            valid_direction = (distance_x, distance_y) in DIRECTIONS_WHITE_PAWN_1
-        else:
-            valid_direction = (distance_x, distance_y) in DIRECTIONS_WHITE_PAWN
-    else:  # BLACK
-        if (distance_x, distance_y) in DIRECTIONS_BLACK_PAWN_2 and destination is not None and destination[PIECE_COLOR] == WHITE:
-            return True
-        # Check forward moves
-        if original[3] == 0:  # Pawn hasn't moved
-            valid_direction = (distance_x, distance_y) in DIRECTIONS_BLACK_PAWN_1
-        else:
-            valid_direction = (distance_x, distance_y) in DIRECTIONS_BLACK_PAWN
-
-    # Check if path is clear
-    if valid_direction:
-        step_x = (distance_x // abs(distance_x)) if distance_x != 0 else 0
-        step_y = (distance_y // abs(distance_y)) if distance_y != 0 else 0
-        x, y = o_x + step_x, o_y + step_y
-        while (x, y) != (d_x, d_y):
-            if board[y][x] is not None:
-                return False
-            x += step_x
-            y += step_y
-
-    # Pawn can only move to empty square (for non-capture moves)
-    if destination is None:
-        return valid_direction
-
-    return False
-
-
-def is_safe_move_simu(state, original_x, original_y, des_x, des_y, color):
-    # Shallow copy for speed
-    temp_state = {'board':[row[:] for row in state['board']],
-                 'last_move_info':state['last_move_info'],
-                 'turn':state['turn'],
-                 'nb_turn':state['nb_turn'],
-                 'move_history':state['move_history'],
-                 }
-
-    move_simu(temp_state['board'], original_x, original_y, des_x, des_y)
-    return not is_check_simu(temp_state, color)
-
-
-def move_simu(board,o_x,o_y,d_x,d_y):
-
-    piece = board[o_y][o_x]
-    board[d_y][d_x] = piece
-    board[o_y][o_x] = None
-
-
-def pieces_remaining_simu(board):
-    pieces = []
-    for y in range(8):
-        for x in range(8):
-            piece = board[y][x]
-            if piece is not None:
-                pieces.append(piece[PIECE_COLOR])
-    return pieces
-
-
-def is_check_simu(state, color):
-    """
-    Check if the king is in check in a simulated board state.
+    gain = capture_gain(state, move)
+    if gain == 0:
+        return 0
+    attacker = abs(state.squares[move & MOVE_SQUARE_MASK])
+    return gain * 10 - ATTACKER_RANK[attacker]
 
-    Args:
-        board (list): 2D list representing the board state
-        color (int): Color of the king we are checking
 
-    Returns:
-        bool: True if the king is in check, False otherwise
+def is_endgame(state):
     """
-    board = state['board']
-    pos = king_pos_simu(board, color)
-    if pos is None:
-        return False
-
-    # Check if any opponent piece can attack the king
-    adversary_color = -color
-    for y in range(8):
-        for x in range(8):
-            piece = board[y][x]
-            if piece is not None and piece[1] == adversary_color:
-                if is_legal_move_simu(state, x, y, pos[0], pos[1]):
-                    return True
-    return False
-
-
-def is_stalemate_simu(state,is_check,color):
-    if is_check:
-        return False
-    if not generate_legal_moves(state, color):
-        return True
-    return False
-
-
-def insufficient_material_simu(state):
-    remaining = pieces_remaining_simu(state['board'])
-    if sorted(remaining) == sorted([KING, KING]):
-        return True
-    if sorted(remaining) == sorted([KING, KING, BISHOP]):
-        return True
-    if sorted(remaining) == sorted([KING, KING, KNIGHT]):
-        return True
-    if sorted(remaining) == sorted([KING, KING, BISHOP, BISHOP]):
-        return True
-    return False
-
-
-def threefold_repetition_simu(state):
-    last_index = len(state['move_history'])-1
-    if last_index >= 9:
-        if (state['last_move_info'] == state['move_history'][last_index - 4]) and (state['move_history'][last_index - 1] == state['move_history'][last_index - 5]):
-            if (state['last_move_info'] == state['move_history'][last_index - 8]) and (state['move_history'][last_index - 1] == state['move_history'][last_index - 9]):
-                return True
-
-    return False
-
-
-def is_draw_simu(state,color,is_check=False):
-    if is_stalemate_simu(state,is_check,color):
-        return True
-    elif insufficient_material_simu(state):
-        return True
-    elif threefold_repetition_simu(state):
-        return True
-    return False
-
-
-def outcome_simu(state,color):
-    if is_check_simu(state,color):
-        return CHECK
-    elif is_draw_simu(state,color):
-        return DRAW
-    return None
-
-
-def king_pos_simu(board, color):
+    Tell whether few pieces other than kings and pawns are left, read from the game phase.
     """
-    Find the position of the king in a simulated board state.
+    return state.phase <= ENDGAME_PHASE
 
-    Args:
-        board (list): 2D list representing the simulated board state
-        color (int): Color of the king to find
 
-    Returns:
-        tuple: Position (x, y) of the king, or None if not found
-    """
-    for y in range(8):
-        for x in range(8):
-            piece = board[y][x]
-            if piece is not None:
-                if piece[0] == KING and piece[1] == color:
-                    return x, y
-
-
-def can_en_passant_simu(state, orig_x, orig_y, des_x, des_y):
-    board = state['board']
-    pawn = board[orig_y][orig_x]
-    if pawn is None or pawn[PIECE_TYPE] != PAWN:
-        return False
-    color = pawn[PIECE_COLOR]
-    # Check Ranks
-    if (color == WHITE and orig_y != 3) or (color == BLACK and orig_y != 4):
-        return False
-    dx = des_x - orig_x
-    dy = des_y - orig_y
-    # Directions
-    if (color == WHITE and (dx, dy) not in DIRECTIONS_WHITE_PAWN_2) or \
-            (color == BLACK and (dx, dy) not in DIRECTIONS_BLACK_PAWN_2):
-        return False
-    # Opponent pawn existence
-    adjacent_pawn = board[orig_y][des_x]
-    if adjacent_pawn is None or adjacent_pawn[PIECE_TYPE] != PAWN or adjacent_pawn[PIECE_COLOR] == color:
-        return False
-    # History check
-    if state['last_move_info'] is None:
-        return False
-    last_move = state['last_move_info']
-    if (last_move[PIECE_TYPE] == PAWN and last_move[TO_X] == des_x and
-            last_move[TO_Y] == orig_y and abs(last_move[FROM_Y] - last_move[TO_Y]) == 2):
-        return True
-    return False
-
-
-def can_castle_king_side_simu(state, color):
+def tapered_eval(state):
     """
-    Vérify if the king side castle is possible
+    Material and positional score of the position, read from the incremental scores of the state.
+    The middlegame and endgame scores are blended by the game phase.
+    Positive = White Advantage, Negative = Black Advantage
     """
-    board = state['board']
-    if color == WHITE:
-        if board[7][4] is None:
-            return False
-        elif board[7][4][PIECE_TYPE] != KING or board[7][4][PIECE_COLOR] != WHITE:
-            return False
-        else:
-            king = board[7][4]
-            king_row = 7
-            king_x = 4
-            rook = board[7][7]
-    else:
-        if board[0][4] is None:
-            return False
-        elif board[0][4][PIECE_TYPE] != KING or board[0][4][PIECE_COLOR] != BLACK:
-            return False
-        else:
-            king = board[0][4]
-            king_row = 0
-            king_x = 4
-            rook = board[0][7]
-
-    if king[PIECE_NB_MOVEMENT] > 0:
-        return False
-    if rook is None or rook[PIECE_TYPE] != ROOK or rook[PIECE_COLOR] != color or rook[PIECE_NB_MOVEMENT] > 0:
-        return False
-
-    # Check that the squares between the king and the rook are empty
-    for x in range(5, 7):
-        if board[king_row][x] is not None:
-            return False
-
-    # Check that the king is not in check and does not pass through an attacked square.
-    if is_check_simu(state, color):
-        return False
-
-    # Simulate the king's movement square by square
-    for x in range(4, 7):
-        if not is_safe_move_simu(state, king_x, king_row, x, king_row, color):
-            return False
+    phase = min(state.phase, MAX_PHASE)
+    return (state.mg_score * phase + state.eg_score * (MAX_PHASE - phase)) // MAX_PHASE
 
-    return True
 
 
-def can_castle_queen_side_simu(state, color):
+def has_piece_material(state, color):
     """
-    Vérify if the king side castle is possible
+    Tell whether a color has any piece other than its king and pawns.
     """
-    board = state['board']
-    if color == WHITE:
-        if board[7][4] is None:
-            return False
-        elif board[7][4][PIECE_TYPE] != KING or board[7][4][PIECE_COLOR] != WHITE:
-            return False
-        else:
-            king = board[7][4]
-            king_row = 7
-            king_x = 4
-            rook = board[7][0]
-    else:
-        if board[0][4] is None:
-            return False
-        elif board[0][4][PIECE_TYPE] != KING or board[0][4][PIECE_COLOR] != BLACK:
-            return False
-        else:
-            king = board[0][4]
-            king_row = 0
-            king_x = 4
-            rook = board[0][0]
-
-    if king[PIECE_NB_MOVEMENT] > 0:
-        return False
-    if rook is None or rook[PIECE_TYPE] != ROOK or rook[PIECE_COLOR] != color or rook[PIECE_NB_MOVEMENT] > 0:
-        return False
-
-    # Check that the squares between the king and the rook are empty
-
-    for x in range(1, 4):
-        if board[king_row][x] is not None:
-            return False
-
-    # Check that the king is not in check and does not pass through an attacked square.
+    pieces = state.pieces[color]
+    return (pieces[KNIGHT] | pieces[BISHOP] | pieces[ROOK] | pieces[QUEEN]) != 0
 
-    if is_check_simu(state, color):
-        return False
 
-    # Simulate the king's movement square by square
-
-    for x in range(4, 1, -1):
-        if not is_safe_move_simu(state, king_x, king_row, x, king_row, color):
-            return False
-
-    return True
-
-
-def execute_en_passant_simu(state, orig_x, orig_y, des_x, des_y):
-    board = state['board']
-    pawn = board[orig_y][orig_x]
-    new_pawn = (pawn[PIECE_TYPE], pawn[PIECE_COLOR], pawn[PIECE_MOVEMENT], pawn[PIECE_NB_MOVEMENT] + 1)
-    board[des_y][des_x] = new_pawn
-    board[orig_y][orig_x] = None
-    board[orig_y][des_x] = None
-
-
-def execute_castle_simu(state, color, king_side=True):
-    board = state['board']
-    king_row = 7 if color == WHITE else 0
-    if king_side:
-        king_new_x, rook_old_x, rook_new_x = 6, 7, 5
-    else:
-        king_new_x, rook_old_x, rook_new_x = 2, 0, 3
-    king = board[king_row][4]
-    if king:
-        new_king = (king[0], king[1], king[2], king[3] + 1)
-        board[king_row][king_new_x] = new_king
-        board[king_row][4] = None
-    rook = board[king_row][rook_old_x]
-    if rook:
-        new_rook = (rook[0], rook[1], rook[2], rook[3] + 1)
-        board[king_row][rook_new_x] = new_rook
-        board[king_row][rook_old_x] = None
-
-
-def generate_legal_moves(state: dict, color: int) -> list:
-    board = state['board']
-    legal_moves = []
-    for o_y in range(len(board)):
-        for o_x in range(len(board[o_y])):
-            piece = board[o_y][o_x]
-            if piece is not None and piece[PIECE_COLOR] == color:
-                for d_y in range(len(board)):
-                    for d_x in range(len(board[o_y])):
-                        if is_legal_move_simu(state, o_x, o_y, d_x, d_y) and \
-                                is_safe_move_simu(state, o_x, o_y, d_x, d_y, color):
-                            legal_moves.append((o_x, o_y, d_x, d_y))
-    return legal_moves
-
-
-def score_move(board:list , move : tuple ) -> int :
-    target = board[move[2]][move[3]]
-    if target is None:
-        return 0
-    else:
-        return PIECE_VALUE[target[PIECE_TYPE]]
-
-
-
-def move_simu_ai(state: dict, o_x: int, o_y: int, d_x: int, d_y: int):
-    board = state['board']
-    if can_en_passant_simu(state, o_x, o_y, d_x, d_y):
-        execute_en_passant_simu(state, o_x, o_y, d_x, d_y)
-        state['last_move_info'] = (PAWN, o_x, o_y, d_x, d_y)
-        state['turn'] = -state['turn']
-        state['move_history'].append(state['last_move_info'])
-
-        return
-
-    piece = board[o_y][o_x]
-    king_castle = (6, 0) if state['turn'] == BLACK else (6, 7)
-    queen_castle = (2, 0) if state['turn'] == BLACK else (2, 7)
-
-    if piece[PIECE_TYPE] == KING and (d_x, d_y) == queen_castle and piece[PIECE_NB_MOVEMENT] == 0:
-        execute_castle_simu(state, piece[PIECE_COLOR], False)
-        state['last_move_info'] = (KING, o_x, o_y, d_x, d_y)
-        state['turn'] = -state['turn']
-        state['move_history'].append(state['last_move_info'])
-        return
-    elif piece[PIECE_TYPE] == KING and (d_x, d_y) == king_castle and piece[PIECE_NB_MOVEMENT] == 0:
-        execute_castle_simu(state, piece[PIECE_COLOR], True)
-        state['last_move_info'] = (KING, o_x, o_y, d_x, d_y)
-        state['turn'] = -state['turn']
-        state['move_history'].append(state['last_move_info'])
-        return
-
-
-    if piece[PIECE_TYPE] == PAWN and piece[PIECE_COLOR] == WHITE and d_y == 0:
-        new_piece = (QUEEN, piece[PIECE_COLOR], SLIDING, piece[PIECE_NB_MOVEMENT] + 1)
-    elif piece[PIECE_TYPE] == PAWN and piece[PIECE_COLOR] == BLACK and d_y == 7:
-        new_piece = (QUEEN, piece[PIECE_COLOR], SLIDING, piece[PIECE_NB_MOVEMENT] + 1)
-    else:
-        new_piece = (piece[0], piece[1], piece[2], piece[3] + 1)
-
-    board[o_y][o_x] = None
-    board[d_y][d_x] = new_piece
-    state['last_move_info'] = (new_piece[PIECE_TYPE], o_x, o_y, d_x, d_y)
-    state['turn'] = -state['turn']
-    state['move_history'].append(state['last_move_info'])
-
-
-def material_eval(state):
+def new_search_stats():
     """
-    Evaluates the board.
-    Returns: Material Score
-    Positive = White Advantage, Negative = Black Advantage
+    Counters of the selective search, reset at the beginning of every search.
     """
-    board = state['board']
-    score_mat = 0
-    for y in range(8):
-        for x in range(8):
-            piece = board[y][x]
-            if piece is not None:
-                if piece[PIECE_COLOR] == WHITE:
-                    score_mat += PIECE_VALUE[piece[PIECE_TYPE]]
-                else:
-                    score_mat -= PIECE_VALUE[piece[PIECE_TYPE]]
-
-    return score_mat
-
-
-def total_material(state):
-    board = state['board']
-    total_mat = 0
-    for y in range(8):
-        for x in range(8):
-            piece = board[y][x]
-            if piece is not None and piece[PIECE_TYPE] != KING:
-                total_mat += PIECE_VALUE[piece[PIECE_TYPE]]
-    return total_mat
+    return {
+        'null_move_cutoffs': 0,
+        'null_move_failed_verifications': 0,
+        'reduced_moves': 0,
+        'reduction_researches': 0,
+    }
 
 
-def is_endgame(state):
-    return total_material(state) < 1300
-
-
-def mobility_eval(state):
-    white_moves = len(generate_legal_moves(state, WHITE))
-    black_moves = len(generate_legal_moves(state, BLACK))
-    return (white_moves - black_moves) * 5
-
-
-def get_position_value(piece,x,y, is_endgame=False):
+def score_to_tt(score, ply):
     """
-    Obtains the positional value of a piece
+    Mate scores count the plies from the root, the table stores them from the current node.
     """
-    piece_type = piece[PIECE_TYPE]
-    color = piece[PIECE_COLOR]
-
-    if piece_type == KING and is_endgame:
-        table = KING_END_GAME_TABLE
-    elif piece_type == KING:
-        table = KING_MIDDLE_GAME_TABLE
-    elif piece_type == QUEEN:
-        table = QUEEN_TABLE
-    elif piece_type == ROOK:
-        table = ROOK_TABLE
-    elif piece_type == PAWN:
-        table = PAWN_TABLE
-    elif piece_type == KNIGHT:
-        table = KNIGHT_TABLE
-    elif piece_type == BISHOP:
-        table = BISHOP_TABLE
-    else:
-        return 0
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
 
-    # Pour les pièces noires, on inverse le tableau
-    if color == BLACK:
-        y = 7 - y
 
-    return table[y][x]
+def score_from_tt(score, ply):
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
 
 
-def positional_eval(state,is_endgame=False):
-    board = state['board']
-    pos_eval = 0
-    for y in range(8):
-        for x in range(8):
-            piece = board[y][x]
-            if piece is not None:
-                if piece[PIECE_COLOR] == WHITE:
-                    pos_eval += get_position_value(piece,x,y,is_endgame)
-                else:
-                    pos_eval -= get_position_value(piece,x,y,is_endgame)
-    return pos_eval
-
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the time or node budget is exhausted.
+    """
+    pass
 
 
 class AI:
-    def __init__(self, game):
+    def __init__(self, game, tt_size_mb=TT_SIZE_MB, randomize=True):
         self.game = game
+        self.randomize = randomize
+        self.killers = [[None, None] for _ in range(MAX_DEPTH + 1)]
+        self.history = {}
+        # Kept from one move to the next, cleared when a new game starts
+        self.tt = TranspositionTable(tt_size_mb)
+        self.nodes = 0
+        self.deadline = None
+        self.node_limit = None
+        self.pv = [[] for _ in range(MAX_DEPTH + 2)]
+        # Selective search parameters, see the constants of the same names
+        self.null_move_reduction = NULL_MOVE_REDUCTION
+        self.null_move_min_depth = NULL_MOVE_MIN_DEPTH
+        self.lmr_reduction = LMR_REDUCTION
+        self.lmr_min_depth = LMR_MIN_DEPTH
+        self.lmr_min_moves = LMR_MIN_MOVES
+        self.stats = new_search_stats()
+        self.principal_variation = []
+        self.best_move = None
+        self.best_score = 0
+        self.depth_reached = 0
+
+    def new_game(self):
+        self.tt.clear()
+        self.history = {}
 
     def evaluate(self, state):
         """
         Evaluates the board.
-        Returns: Material Score + Positional Score + Mobility score
+        Returns: Material Score + Positional Score (tapered between middlegame and endgame)
         Positive = White Advantage, Negative = Black Advantage
         """
-        board = state['board']
         value = 0
 
-        material_score = material_eval(state)
-
-       # mobility_score = mobility_eval(board)
-
-        positional_score = positional_eval(state,is_endgame(state))
-
-       # value += material_score + mobility_score + positional_score
-        value += material_score +  positional_score
-
-        outcome_white = outcome_simu(state,WHITE)
-        outcome_black = outcome_simu(state,BLACK)
-        if outcome_white == CHECK:
-            value-= 100
-        elif outcome_black == CHECK:
-            value+= 100
-        elif outcome_black or outcome_white == DRAW:
+        # Material and piece-square scores are kept up to date by make_move/unmake_move
+        value += tapered_eval(state)
+
+        # Only the side to move can be in check, or out of moves
+        status = game_status_simu(state)
+        if status == CHECK:
+            value -= 100 * state.turn
+        elif status == WHITE_CHECKMATE:
+            value = -MATE_BOUND
+        elif status == BLACK_CHECKMATE:
+            value = MATE_BOUND
+        elif status != GAME_IN_PROGRESS:
             value = 0
 
 
@@ -702,71 +163,398 @@ class AI:
 
 
 
-    def minimax(self, state, depth, alpha, beta, maximizing_player):
-        current_color = state['turn']
-        possible_moves = generate_legal_moves(state, current_color)
-        possible_moves.sort(key=lambda m:score_move(state['board'],m), reverse=True)
-
-        if not possible_moves:
-            if is_check_simu(state, current_color):
-                return (-1000000 if maximizing_player else 1000000), None
-            else:
-                return 0, None
+    def negamax(self, state, depth, alpha, beta, ply=0, allow_null=True):
+        """
+        Principal variation search, scores are seen from the side to move.
+
+        The first move of a node is searched with the full window, the other moves with a
+        null window proving they are not better. A move that fails high is searched again
+        with the full window. The principal variation of the node is left in self.pv[ply].
+
+        Outside the principal variation, the side to move first passes its turn: if the
+        position still fails high with a reduced depth, the node is cut (null move pruning).
+        Late quiet moves are searched with a reduced depth and searched again at full
+        depth when they turn out better than alpha (late move reductions).
+
+        Args:
+            state (Position): Position searched, modified in place and restored
+            depth (int): Remaining depth before the quiescence search
+            alpha (int): Lower bound of the window
+            beta (int): Upper bound of the window
+            ply (int): Distance from the root
+            allow_null (bool): False right after a null move, two null moves in a row prove nothing
+
+        Returns:
+            int: Score of the position for the side to move
+        """
+        self.nodes += 1
+        if self.nodes % NODE_CHECK_INTERVAL == 0:
+            self.check_limits()
+        self.pv[ply] = []
+        pv_node = beta - alpha > 1
+
+        # Going back to a position of the current line or of the game is a draw: a side
+        # that can repeat once can repeat again, searching the cycle further is wasted
+        if ply > 0 and state.is_repetition():
+            return 0
+
+        key = state.hash
+        hash_move = None
+        entry = self.tt.probe(key)
+        if entry is not None:
+            hash_move = entry[TT_MOVE]
+            # The table never cuts a PV node, its principal variation would be lost
+            if entry[TT_DEPTH] >= depth and not pv_node:
+                score = score_from_tt(entry[TT_SCORE], ply)
+                flag = entry[TT_FLAG]
+                if flag == EXACT or (flag == LOWER_BOUND and score >= beta) or (flag == UPPER_BOUND and score <= alpha):
+                    return score
+
+        current_color = state.turn
+        in_check = is_check_simu(state, current_color)
+
+        # Passing is always worse than the best move, except in zugzwang: never try it
+        # in the endgame or when the side to move only has its king and pawns left
+        if (allow_null and not pv_node and not in_check and depth >= self.null_move_min_depth
+                and has_piece_material(state, current_color) and not is_endgame(state)):
+            reduced_depth = max(0, depth - 1 - self.null_move_reduction)
+            undo = state.make_null_move()
+            score = -self.negamax(state, reduced_depth, -beta, -beta + 1, ply + 1, False)
+            state.unmake_null_move(undo)
+            if score >= beta:
+                # A mate found after passing is not a real mate
+                if score >= MATE_BOUND:
+                    score = beta
+                if depth < NULL_MOVE_VERIFY_DEPTH or self.negamax(state, reduced_depth, beta - 1, beta, ply, False) >= beta:
+                    self.stats['null_move_cutoffs'] += 1
+                    return score
+                self.stats['null_move_failed_verifications'] += 1
+                self.pv[ply] = []
 
         if depth == 0:
-            return self.evaluate(state), None
+            # Mates and stalemates on the horizon are found by the evaluation
+            score = self.quiescence(state, alpha, beta, ply)
+            self.store(key, 0, score, alpha, beta, None, ply)
+            return score
+
+        if ply == 0:
+            possible_moves = generate_legal_moves(state, current_color)
+            if self.randomize:
+                # Shuffle so the AI isn't too predictable between moves ordered the same
+                random.shuffle(possible_moves)
+            self.order_moves(state, possible_moves, hash_move, ply)
+        else:
+            possible_moves = self.staged_moves(state, hash_move, ply)
 
+        alpha_orig = alpha
+        best_score = -INFINITE_SCORE
         best_move = None
-        # Shuffle so the AI isn't too predictable at equal levels
-        random.shuffle(possible_moves)
-
-        if maximizing_player:
-            max_eval = -float('inf')
-            for move in possible_moves:
-                ox, oy, dx, dy = move
-                new_board = [row[:] for row in state['board']]
-                new_state = {
-                    'board': new_board,
-                    'turn': state['turn'],
-                    'nb_turn': state['nb_turn'],
-                    'last_move_info': state['last_move_info'],
-                    'move_history' : state['move_history']
-                }
-                move_simu_ai(new_state, ox, oy, dx, dy)
-                eval, _ = self.minimax(new_state, depth - 1, alpha, beta, False)
-                if eval > max_eval:
-                    max_eval = eval
-                    best_move = move
-                alpha = max(alpha, eval)
-                if beta <= alpha:
-                    break
-            return max_eval, best_move
+        killers = self.killers[ply]
+        can_reduce = depth >= self.lmr_min_depth and not in_check
+        for index, move in enumerate(possible_moves):
+            reduction = 0
+            if can_reduce and index >= self.lmr_min_moves and move not in killers and is_quiet_move(move):
+                reduction = self.lmr_reduction
+            undo = state.make_move(move)
+            if index == 0:
+                score = -self.negamax(state, depth - 1, -beta, -alpha, ply + 1)
+            else:
+                # Moves giving check are never reduced
+                if reduction and is_check_simu(state, state.turn):
+                    reduction = 0
+                score = -self.negamax(state, depth - 1 - reduction, -alpha - 1, -alpha, ply + 1)
+                if reduction:
+                    self.stats['reduced_moves'] += 1
+                    if score > alpha:
+                        self.stats['reduction_researches'] += 1
+                        score = -self.negamax(state, depth - 1, -alpha - 1, -alpha, ply + 1)
+                if alpha < score < beta:
+                    score = -self.negamax(state, depth - 1, -beta, -alpha, ply + 1)
+            state.unmake_move(undo)
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    self.pv[ply] = [move] + self.pv[ply + 1]
+                    if alpha >= beta:
+                        self.update_quiet_move(state, move, depth, ply)
+                        break
+
+        if best_move is None:
+            # No legal move: checkmate or stalemate
+            score = -(MATE_SCORE - ply) if in_check else 0
+            self.tt.store(key, MAX_DEPTH, score_to_tt(score, ply), EXACT, None)
+            return score
+        self.store(key, depth, best_score, alpha_orig, beta, best_move, ply)
+        return best_score
+
+    def staged_moves(self, state, hash_move, ply):
+        """
+        Yield the legal moves of the side to move stage by stage, best candidates first:
+        the hash move, the captures by MVV-LVA, the killer moves, then the quiet moves by history.
+
+        A stage is only generated when the previous ones did not cause a cutoff, so a node
+        cut by its hash move or by a capture never generates its quiet moves.
+        In check, the evasions are few and are all generated and ordered at once.
+        """
+        color = state.turn
+        info = check_info(state, color)
+        if info[1]:
+            evasions = list(iter_evasions(state, color, info))
+            self.order_moves(state, evasions, hash_move, ply)
+            yield from evasions
+            return
+
+        if hash_move is not None and is_valid_move_simu(state, info, hash_move, color):
+            yield hash_move
+        else:
+            hash_move = None
+
+        captures = generate_captures(state, color, info)
+        captures.sort(key=lambda m: score_move(state, m), reverse=True)
+        for move in captures:
+            if move != hash_move:
+                yield move
+
+        killers = []
+        for move in self.killers[ply][:]:
+            if (move is not None and move != hash_move and is_valid_move_simu(state, info, move, color)
+                    and is_quiet_move(move)):
+                killers.append(move)
+                yield move
+
+        quiets = generate_quiet_moves(state, color, info)
+        history = self.history
+        quiets.sort(key=lambda m: history.get(m, 0), reverse=True)
+        for move in quiets:
+            if move != hash_move and move not in killers:
+                yield move
+
+    def order_moves(self, state, moves, hash_move, ply):
+        """
+        Sort moves in place: hash move, captures by MVV-LVA, killer moves, then quiet moves by history.
+        """
+        killers = self.killers[ply]
+        history = self.history
+
+        def priority(move):
+            if move == hash_move:
+                return HASH_MOVE_PRIORITY
+            capture = score_move(state, move)
+            if capture > 0:
+                return CAPTURE_PRIORITY + capture
+            if move == killers[0]:
+                return KILLER_PRIORITY + 1
+            if move == killers[1]:
+                return KILLER_PRIORITY
+            return history.get(move, 0)
+
+        moves.sort(key=priority, reverse=True)
+
+    def update_quiet_move(self, state, move, depth, ply):
+        """
+        Remember a quiet move that caused a cutoff as a killer of its ply and in the history table.
+        """
+        if not is_quiet_move(move):
+            return
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        score = self.history.get(move, 0) + depth * depth
+        self.history[move] = score
+        if score > HISTORY_MAX:
+            for quiet in self.history:
+                self.history[quiet] //= 2
+
+    def quiescence(self, state, alpha, beta, ply):
+        """
+        Search only captures and promotions so the horizon is never in the middle of an exchange.
+
+        The side to move may always stand pat on the static evaluation. A capture is skipped
+        when even winning the captured piece (plus DELTA_MARGIN) cannot raise the score to alpha.
+        Scores are seen from the side to move, like in negamax.
+        """
+        self.nodes += 1
+        if self.nodes % NODE_CHECK_INTERVAL == 0:
+            self.check_limits()
+
+        stand_pat = state.turn * self.evaluate(state)
+        if stand_pat <= -MATE_BOUND:
+            # Checkmated, scored from the root like the mates of the search
+            return -(MATE_SCORE - ply)
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        captures = generate_captures(state, state.turn)
+        captures.sort(key=lambda m: score_move(state, m), reverse=True)
+        best = stand_pat
+        for move in captures:
+            if stand_pat + capture_gain(state, move) + DELTA_MARGIN <= alpha:
+                continue
+
+            undo = state.make_move(move)
+            score = -self.quiescence(state, -beta, -alpha, ply + 1)
+            state.unmake_move(undo)
+
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best
+
+    def store(self, key, depth, score, alpha, beta, best_move, ply):
+        """
+        Store a search result in the transposition table with the bound given by the window.
+        """
+        if score <= alpha:
+            flag = UPPER_BOUND
+        elif score >= beta:
+            flag = LOWER_BOUND
         else:
-            min_eval = float('inf')
-            for move in possible_moves:
-                ox, oy, dx, dy = move
-                new_board = [row[:] for row in state['board']]
-                new_state = {
-                    'board': new_board,
-                    'turn': state['turn'],
-                    'nb_turn': state['nb_turn'],
-                    'last_move_info': state['last_move_info'],
-                    'move_history': state['move_history']
-                }
-                move_simu_ai(new_state, ox, oy, dx, dy)
-                eval, _ = self.minimax(new_state, depth - 1, alpha, beta, True)
-                if eval < min_eval:
-                    min_eval = eval
-                    best_move = move
-                beta = min(beta, eval)
-                if beta <= alpha:
-                    break
-            return min_eval, best_move
-
-
-
-    def get_best_move(self, depth=2):
-        state = self.game.copy()
-        is_white_turn = (self.game.turn == WHITE)
-        _, move = self.minimax(state, depth, -float('inf'), float('inf'), is_white_turn)
-        return move
+            flag = EXACT
+        self.tt.store(key, depth, score_to_tt(score, ply), flag, best_move)
+
+    def aspiration_search(self, state, depth, previous_score):
+        """
+        Search the root with a window around the score of the previous iteration.
+
+        When the score falls outside the window, the window is widened on that side and the
+        root is searched again, until it is opened completely past ASPIRATION_MAX.
+
+        Args:
+            state (Position): Root position
+            depth (int): Depth of the iteration
+            previous_score (int): Score of the previous iteration, None for the first one
+
+        Returns:
+            int: Score of the root for the side to move
+        """
+        if previous_score is None or abs(previous_score) >= MATE_BOUND:
+            return self.negamax(state, depth, -INFINITE_SCORE, INFINITE_SCORE)
+
+        delta = ASPIRATION_WINDOW
+        alpha, beta = previous_score - delta, previous_score + delta
+        while True:
+            score = self.negamax(state, depth, alpha, beta)
+            if score <= alpha:
+                alpha = max(score - delta, -INFINITE_SCORE)
+            elif score >= beta:
+                beta = min(score + delta, INFINITE_SCORE)
+            else:
+                return score
+            delta *= 2
+            if delta > ASPIRATION_MAX:
+                alpha, beta = -INFINITE_SCORE, INFINITE_SCORE
+
+    def check_limits(self):
+        """
+        Stop the search once the time or node budget is spent.
+        """
+        if self.deadline is not None and time.time() >= self.deadline:
+            raise SearchTimeout()
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchTimeout()
+
+    def time_budget(self, color):
+        """
+        Time the AI may spend on its move, from its remaining clock and the increment.
+
+        Args:
+            color (int): Color played by the AI
+
+        Returns:
+            float: Thinking time in seconds
+        """
+        # A game without display has no clock
+        if getattr(self.game, "time", None) is None:
+            return AI_MOVE_TIME
+        remaining = self.game.white_time if color == WHITE else self.game.black_time
+        # The game is lost once the clock goes under one second
+        remaining -= 1
+        budget = remaining / MOVES_TO_GO + self.game.increment_time * 0.8
+        return max(MIN_MOVE_TIME, min(budget, remaining / 4))
+
+    def get_best_move(self, depth=None, time_limit=None, node_limit=None):
+        """
+        Search the current position with iterative deepening.
+
+        Every completed iteration updates best_move, best_score (seen from the AI's side),
+        principal_variation and depth_reached.
+        Without any limit given, the time budget comes from the AI's clock.
+
+        Args:
+            depth (int): Maximum depth to search
+            time_limit (float): Maximum thinking time in seconds
+            node_limit (int): Maximum number of nodes to visit
+
+        Returns:
+            int: Encoded best move of the last completed iteration
+        """
+        state = self.game.position.copy()
+        legal_moves = generate_legal_moves(state, state.turn)
+        if not legal_moves:
+            return None
+        self.tt.new_search()
+        self.killers = [[None, None] for _ in range(MAX_DEPTH + 1)]
+        for move in self.history:
+            self.history[move] //= 2
+        if depth is None and time_limit is None and node_limit is None:
+            time_limit = self.time_budget(state.turn)
+        if depth is None:
+            depth = MAX_DEPTH
+
+        start = time.time()
+        deadline = start + time_limit if time_limit is not None else None
+        # The first iteration always finishes, the limits apply once it has given a move
+        self.deadline = None
+        self.node_limit = None
+        self.nodes = 0
+        self.best_move = None
+        self.best_score = 0
+        self.depth_reached = 0
+        self.principal_variation = []
+        self.stats = new_search_stats()
+
+        previous_score = None
+        for current_depth in range(1, depth + 1):
+            try:
+                score = self.aspiration_search(state, current_depth, previous_score)
+            except SearchTimeout:
+                break
+            if not self.pv[0]:
+                break
+            previous_score = score
+            self.principal_variation = self.pv[0][:]
+            self.best_move, self.best_score, self.depth_reached = self.pv[0][0], score, current_depth
+            self.deadline, self.node_limit = deadline, node_limit
+            # Stop on a forced mate, or when the next iteration would not finish in time
+            if abs(score) >= MATE_BOUND:
+                break
+            if deadline is not None and time.time() - start > (deadline - start) / 2:
+                break
+
+        if self.best_move is None:
+            # The search gave no line: play the move it would have tried first
+            entry = self.tt.probe(state.hash)
+            self.order_moves(state, legal_moves, entry[TT_MOVE] if entry is not None else None, 0)
+            self.best_move = legal_moves[0]
+        return self.best_move
+
+    def search_info(self):
+        """
+        Summary of the last search: depth, nodes, score and selective search statistics.
+
+        Returns:
+            str: One line report
+        """
+        stats = self.stats
+        return (f"depth {self.depth_reached}, {self.nodes} nodes, score {self.best_score}, "
+                f"{stats['null_move_cutoffs']} null move cutoffs "
+                f"({stats['null_move_failed_verifications']} failed verifications), "
+                f"{stats['reduced_moves']} reduced moves ({stats['reduction_researches']} searched again)")
@@ -0,0 +1,243 @@
+from utils.rules import *
+from classes.stack import *
+
+PROMOTION_PIECES = (KNIGHT, BISHOP, ROOK, QUEEN)
+
+
+class ChessGame:
+    """
+    A game of chess without display nor sound: the position, the moves played and their notation.
+
+    Moves are the encoded ints of utils/moves.py. Nothing here imports pygame, so games can be
+    played, analysed or simulated without a window; the pygame Game plays its moves through one
+    of these and draws its board from the position after every change.
+    """
+    def __init__(self, fen=START_FEN):
+        self.start_fen = fen
+        self.position = Position.from_fen(fen)
+        # Records (move, position undo, notation), the cancelled moves can be played again
+        self.history = MoveHistory()
+        # Legal moves of the side to move, computed once per position
+        self._legal_moves = None
+        self._legal_set = None
+
+    def __len__(self):
+        return len(self.history)
+
+    @property
+    def turn(self):
+        return self.position.turn
+
+    def legal_moves(self):
+        """
+        Legal moves of the side to move. Pawns reaching the last rank are listed once,
+        promoting to a queen; push accepts the same move with any other promotion piece.
+
+        Returns:
+            list: Encoded moves
+        """
+        if self._legal_moves is None:
+            self._legal_moves = generate_legal_moves(self.position, self.position.turn)
+            self._legal_set = set(self._legal_moves)
+        return self._legal_moves
+
+    def is_legal(self, move):
+        self.legal_moves()
+        if move_promotion(move):
+            return move_promotion(move) in PROMOTION_PIECES and with_promotion(move, QUEEN) in self._legal_set
+        return move in self._legal_set
+
+    def is_check(self):
+        return is_check_simu(self.position, self.position.turn)
+
+    def push(self, move):
+        """
+        Play a legal move.
+
+        Args:
+            move (int): The encoded move
+
+        Returns:
+            str: Standard algebraic notation of the move
+
+        Raises:
+            ValueError: If the move is not legal in the current position
+        """
+        if not self.is_legal(move):
+            raise ValueError(f"Illegal move {move} in {self.fen()}")
+        notation = self.san(move)
+        undo = self.position.make_move(move)
+        self.history.push((move, undo, notation))
+        self._legal_moves = None
+        return notation
+
+    def pop(self):
+        """
+        Take back the last move played. It can be played again with redo.
+
+        Returns:
+            int: The encoded move, None if no move was played
+        """
+        record = self.history.pop()
+        if record is None:
+            return None
+        self.position.unmake_move(record[RECORD_UNDO])
+        self._legal_moves = None
+        return record[RECORD_MOVE]
+
+    def next_move(self):
+        """
+        The last move taken back, None if there is none or another move was played since.
+        """
+        record = self.history.next_record()
+        return record[RECORD_MOVE] if record is not None else None
+
+    def redo(self):
+        move = self.next_move()
+        if move is None:
+            return None
+        return self.push(move)
+
+    def last_ply(self):
+        """
+        Number of halfmoves known: the moves played and the cancelled ones that can be played again.
+        """
+        return len(self.history.records)
+
+    def go_to_ply(self, ply):
+        """
+        Take back or play again moves until the given number of halfmoves have been played.
+
+        Args:
+            ply (int): Number of halfmoves from the start of the game, limited to the moves known
+        """
+        while len(self) > ply:
+            self.pop()
+        while len(self) < ply and self.next_move() is not None:
+            self.redo()
+
+    def outcome(self):
+        """
+        Outcome of the game in the current position.
+
+        Returns:
+            int: GAME_IN_PROGRESS, WHITE_CHECKMATE/BLACK_CHECKMATE (the side mated),
+                 STALEMATE, INSUFFICIENT, THREEFOLD or FIFTY_MOVES
+        """
+        state = self.position
+        if not self.legal_moves():
+            if self.is_check():
+                return WHITE_CHECKMATE if state.turn == WHITE else BLACK_CHECKMATE
+            return STALEMATE
+        if state.has_insufficient_material():
+            return INSUFFICIENT
+        if threefold_repetition_simu(state):
+            return THREEFOLD
+        if fifty_move_simu(state):
+            return FIFTY_MOVES
+        return GAME_IN_PROGRESS
+
+    def is_over(self):
+        return self.outcome() != GAME_IN_PROGRESS
+
+    def result(self):
+        """
+        Result of the game as written in a PGN.
+
+        Returns:
+            str: "1-0", "0-1", "1/2-1/2" or "*" while the game goes on
+        """
+        outcome = self.outcome()
+        if outcome == WHITE_CHECKMATE:
+            return "0-1"
+        elif outcome == BLACK_CHECKMATE:
+            return "1-0"
+        elif outcome == GAME_IN_PROGRESS:
+            return "*"
+        return "1/2-1/2"
+
+    def san(self, move):
+        """
+        Standard algebraic notation of a legal move of the current position.
+
+        Args:
+            move (int): The encoded move
+
+        Returns:
+            str: The move, like "Nbd7", "exd6", "e8=Q+" or "O-O-O#"
+        """
+        state = self.position
+        origin, destination, promotion, flags = decode_move(move)
+        piece_type = abs(state.squares[origin])
+        capture = flags & (CAPTURE_FLAG | EN_PASSANT_FLAG)
+        target = COLUMNS[destination % 8] + ROWS[destination // 8]
+
+        if flags & CASTLE_FLAG:
+            notation = "O-O" if destination > origin else "O-O-O"
+        elif piece_type == PAWN:
+            notation = (COLUMNS[origin % 8] + "x" if capture else "") + target
+            if promotion:
+                notation += "=" + PIECE_PGN[promotion]
+        else:
+            # Other pieces of the same type that can reach the destination
+            others = [move_from(other) for other in self.legal_moves()
+                      if move_to(other) == destination and move_from(other) != origin
+                      and abs(state.squares[move_from(other)]) == piece_type]
+            disambiguation = ""
+            if others:
+                if all(other % 8 != origin % 8 for other in others):
+                    disambiguation = COLUMNS[origin % 8]
+                elif all(other // 8 != origin // 8 for other in others):
+                    disambiguation = ROWS[origin // 8]
+                else:
+                    disambiguation = COLUMNS[origin % 8] + ROWS[origin // 8]
+            notation = PIECE_PGN[piece_type] + disambiguation + ("x" if capture else "") + target
+
+        undo = state.make_move(move)
+        if is_check_simu(state, state.turn):
+            notation += "+" if has_legal_move(state, state.turn) else "#"
+        state.unmake_move(undo)
+        return notation
+
+    def moves(self):
+        return self.history.moves()
+
+    def fen(self):
+        return self.position.to_fen()
+
+    def pgn(self, result=None, white="Player_1", black="Player_2"):
+        """
+        The game in Portable Game Notation, from its starting position.
+
+        Args:
+            result (str): Result to write, read from the position when None
+            white (str): Name of the white player
+            black (str): Name of the black player
+
+        Returns:
+            str: The PGN headers followed by the moves
+        """
+        if result is None:
+            result = self.result()
+        start = self.start_fen.split()
+        nb_turn = int(start[5]) if len(start) > 5 else 1
+        turn = WHITE if start[1] == 'w' else BLACK
+        movetext = ""
+        for record in self.history.records[:len(self.history)]:
+            if turn == WHITE:
+                movetext += f"{nb_turn}. "
+            elif not movetext:
+                movetext += f"{nb_turn}... "
+            movetext += f"{record[RECORD_SAN]} "
+            if turn == BLACK:
+                nb_turn += 1
+            turn = -turn
+        return (f'[Event ""]\n'
+                f'[Site ""]\n'
+                f'[Date ""]\n'
+                f'[Round ""]\n'
+                f'[White "{white}"]\n'
+                f'[Black "{black}"]\n'
+                f'[Result "{result}"]\n'
+                f'[FEN "{self.start_fen}"]\n'
+                f'{movetext}{result}')
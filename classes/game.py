@@ -3,7 +3,7 @@ from classes.pieces import Pieces
 
 from classes.interface import *
 from classes.AI import*
-from classes.stack import *
+from classes.chess_game import *
 
 
 
@@ -16,10 +16,12 @@ class Game:
         self.in_ath_selection = False
         self.in_opponent_selection = False
         self.screen = None
+        # Sprites of the pieces, drawn from the position of the game after every change
         self.board = []
+        # Legal moves of the side to move, {(x, y): {(des_x, des_y): encoded move}}, computed once per turn
+        self.legal_moves = {}
         self.board_color = CLASSICAL_BORD
         self.path = "pieces"
-        self.state = {}
         self.time_is_stop = False
         self.is_increment = False
         self.increment_time = 0
@@ -32,47 +34,58 @@ class Game:
         self.checkmate = None
         self.draw = None
         self.outcome = None
-        self.last_move = None
-        self.list_move = Stack()
-        self.white_roque = True
-        self.black_roque = True
-        self.game_start_sound = pygame.mixer.Sound(f"assets/sounds/game-start.mp3")
-        self.game_end_sound = pygame.mixer.Sound(f"assets/sounds/game-end.mp3")
-        self.move_self_sound = pygame.mixer.Sound(f"assets/sounds/move-self.mp3")
-        self.move_check_sound = pygame.mixer.Sound("assets/sounds/move-check.mp3")
-        self.move_illegal_sound = pygame.mixer.Sound("assets/sounds/illegal.mp3")
-        self.capture_sound = pygame.mixer.Sound("assets/sounds/capture.mp3")
-        self.castle_sound = pygame.mixer.Sound("assets/sounds/castle.mp3")
+        # The game without display: rules, moves played and notation. This class only shows it
+        self.chess = ChessGame()
+        # Sounds are loaded with the screen
+        self.game_start_sound = None
+        self.game_end_sound = None
+        self.move_self_sound = None
+        self.move_check_sound = None
+        self.move_illegal_sound = None
+        self.capture_sound = None
+        self.castle_sound = None
         self.ai = AI(self)
         self.ai_enabled = True
+        # Print the statistics of every AI search
+        self.verbose = False
         self.reverse = False
 
 
 
+    @property
+    def position(self):
+        return self.chess.position
+
     def set_screen(self,screen):
         self.screen = screen
+        if self.game_start_sound is None:
+            self.load_sounds()
+
+    def load_sounds(self):
+        self.game_start_sound = pygame.mixer.Sound(f"assets/sounds/game-start.mp3")
+        self.game_end_sound = pygame.mixer.Sound(f"assets/sounds/game-end.mp3")
+        self.move_self_sound = pygame.mixer.Sound(f"assets/sounds/move-self.mp3")
+        self.move_check_sound = pygame.mixer.Sound("assets/sounds/move-check.mp3")
+        self.move_illegal_sound = pygame.mixer.Sound("assets/sounds/illegal.mp3")
+        self.capture_sound = pygame.mixer.Sound("assets/sounds/capture.mp3")
+        self.castle_sound = pygame.mixer.Sound("assets/sounds/castle.mp3")
 
-    def set_board(self,board=PLATEAU_INITIAL):
-        for y in range(len(board)):
-            row = []
-            for x in range(len(board[y])):
-                pieces = board[y][x]
-                if pieces != EMPTY:
-                    obj = Pieces(self,pieces[0], x, y, pieces[1])
-                    row.append(obj)
-                else: row.append(None)
-            self.board.append(row)
+    def set_board(self,fen=START_FEN):
+        self.chess = ChessGame(fen)
+        self.board = [[None] * 8 for _ in range(8)]
+        self.observe()
 
     def reinitialise_game(self):
         self.board = []
+        self.legal_moves = {}
+        self.chess = ChessGame()
         self.turn = WHITE
         self.nb_turn = 1
-        self.white_roque = True
-        self.black_roque = True
         self.checkmate = False
         self.check = False
         self.draw = False
         self.set_time(self.time)
+        self.ai.new_game()
 
 
     def update(self):
@@ -92,111 +105,62 @@ class Game:
                     self.screen.blit(self.board[y][x].image, self.board[y][x].rect)
 
 
-    def switch_turn(self):
-        self.turn = -self.turn
-        display_current_player(self)
-        if self.turn == WHITE:
-            self.nb_turn += 1
-        return self.turn
+    def observe(self):
+        """
+        Read the game back after a move was played, cancelled or redone: the pieces of the
+        board, the turn, its legal moves and the outcome.
+        """
+        self.sync_board()
+        self.turn = self.chess.turn
+        self.nb_turn = self.position.nb_turn
+        self.refresh_legal_moves()
 
-    def copy(self):
-        board = self.board
-        grid = []
-        for y in range(8):
-            row = []
-            for x in range(8):
-                piece = board[y][x]
-                if piece is None:
-                    row.append(None)
-                else:
-                    row.append((piece.type_piece,piece.color,piece.movement_type,piece.nb_move))
-            grid.append(row)
-
-        if self.last_move:
-            last_move_info = (self.last_move['piece_type'],
-                              self.last_move['from_x'],
-                              self.last_move['from_y'],
-                              self.last_move['to_x'],
-                              self.last_move['to_y'])
-        else :
-            last_move_info = None
-        state = {'board':grid,
-                 'last_move_info':last_move_info,
-                 'turn':self.turn,
-                 'nb_turn':self.nb_turn,
-                 'move_history':list(self.list_move.items),
-                 }
-        return state
-
-    def is_checkmate(self,color):
-        if not self.check:
-            return False
+    def sync_board(self):
+        """
+        Put on the board the pieces of the position. A square keeps its sprite while its piece
+        does not change, so only the pieces that moved are created again.
+        """
+        squares = self.position.squares
         for y in range(8):
             for x in range(8):
+                code = squares[square(x, y)]
                 piece = self.board[y][x]
-                if piece is not None and piece.color == color:
-                    if piece.count_possible_move() != 0:
-                        return False
-        return True
-
-    def is_draw(self, color):
-        if self.is_pat(color):
-            return True,STALEMATE
-        elif self.insufficient_material():
-            return True,INSUFFICIENT
-        elif self.threefold_repetition():
-            return True,THREEFOLD
-        return False,GAME_IN_PROGRESS
-
-    def what_outcome(self):
-        self.checkmate = self.is_checkmate(self.turn)
-        self.draw, self.outcome = self.is_draw(self.turn)
-
-        if self.checkmate:
-            if self.turn == WHITE:
-                self.outcome = WHITE_CHECKMATE
-            else:
-                self.outcome = BLACK_CHECKMATE
-
-
-
-
-
+                if code == EMPTY:
+                    self.board[y][x] = None
+                elif piece is None or piece.color * piece.type_piece != code:
+                    color = WHITE if code > 0 else BLACK
+                    self.board[y][x] = Pieces(self, color, x, y, code * color)
 
+    def show_position(self):
+        """
+        Draw the board, its pieces and the check after the game changed.
+        """
+        display_current_player(self)
+        draw_board(self.screen, self)
+        if self.check:
+            draw_check(self, self.turn)
+        self.update()
 
-    def is_pat(self,color):
-        if  self.check:
-            return False
-        for y in range(8):
-            for x in range(8):
-                piece = self.board[y][x]
-                if piece is not None and piece.color == color:
-                    if piece.count_possible_move() != 0:
-                        return False
-        return True
-
-    def insufficient_material(self):
-        remaining = self.pieces_remaining()
-        if sorted(remaining) == sorted([KING, KING]):
-            return True
-        if sorted(remaining) == sorted([KING, KING, BISHOP]):
-            return True
-        if sorted(remaining) == sorted([KING, KING, KNIGHT]):
-            return True
-        if sorted(remaining) == sorted([KING, KING, BISHOP, BISHOP]):
-            return True
-        return False
-
-    def threefold_repetition(self):
-        last_index = len(self.list_move.items)-1
-        if last_index >= 9:
-            if (self.last_move == self.list_move.items[last_index - 4]) and (self.list_move.items[last_index - 1] == self.list_move.items[last_index - 5]):
-                if (self.last_move == self.list_move.items[last_index - 8]) and (self.list_move.items[last_index - 1] == self.list_move.items[last_index - 9]):
-                    return True
-
-        return False
+    def choose_promotion(self):
+        return select_promotion(self, self.turn)
 
+    def refresh_legal_moves(self):
+        """
+        Compute the legal moves of the side to move in a single pass, then the check and
+        the outcome of the position. Highlighting, move validation, outcome detection and
+        notation all read these moves until the turn changes again.
+        """
+        self.legal_moves = {}
+        for legal_move in self.chess.legal_moves():
+            o_x, o_y, d_x, d_y = move_coordinates(legal_move)
+            self.legal_moves.setdefault((o_x, o_y), {})[(d_x, d_y)] = legal_move
+        self.check = self.chess.is_check()
+        self.what_outcome()
 
+    def what_outcome(self):
+        self.outcome = self.chess.outcome()
+        self.checkmate = self.outcome in (WHITE_CHECKMATE, BLACK_CHECKMATE)
+        self.draw = self.outcome in (STALEMATE, INSUFFICIENT, THREEFOLD, FIFTY_MOVES)
 
     def set_time(self,time):
         self.white_time = time
@@ -239,10 +203,9 @@ class Game:
         draw_board(self.screen,self)
         clock = pygame.time.Clock()
         selected_square = None
+        back_to_menu = False
         self.game_start_sound.play()
         self.update()
-        coup = []
-        list_coup = []
         if self.time is not None:
             self.start_time()
         while self.is_playing:
@@ -263,23 +226,20 @@ class Game:
                 if self.turn == BLACK:
                     print("The Black AI is thinking ...")
 
-                    coup_ia = self.ai.get_best_move(depth=2)
+                    coup_ia = self.ai.get_best_move()
+                    if self.verbose:
+                        print(self.ai.search_info())
+                    # The thinking time is charged to the AI, not to the next frame of its opponent
+                    think_time = clock.tick() / 1000
+                    if self.time is not None:
+                        self.decrement_time(self.turn, think_time)
                 #else:
                 #   print("The Black AI is thinking ...")
-                #   coup_ia = self.ai.get_best_move(depth=2)
+                #   coup_ia = self.ai.get_best_move()
 
-                    if coup_ia:
+                    if coup_ia is not None:
                         # On joue le coup avec la fonction normale qui gère l'affichage et le son
-                        movement = move(self, coup_ia[0], coup_ia[1], coup_ia[2], coup_ia[3],isAi=True)
-
-                        if movement is not None:
-                            if self.turn == BLACK:
-                                coup.append(movement)
-
-                            else:
-                                coup.append(movement)
-                                list_coup.append(coup)
-                                coup = []
+                        move(self, *move_coordinates(coup_ia), isAi=True)
 
 
             for event in pygame.event.get():
@@ -295,31 +255,23 @@ class Game:
                         if xy_to_chess(event.pos) is not None:
                             end_x, end_y = xy_to_chess(event.pos)
                             if self.reverse:
-                                movement = move(self, start_x, start_y, 7-end_x, 7-end_y)
+                                move(self, start_x, start_y, 7-end_x, 7-end_y)
                             else:
-                                movement = move(self, start_x, start_y, end_x, end_y)
-
-                            if movement is not None:
-                                if self.turn == BLACK:
-                                    coup.append(movement)
-
-                                else:
-                                    coup.append(movement)
-                                    list_coup.append(coup)
-                                    coup = []
+                                move(self, start_x, start_y, end_x, end_y)
 
                         selected_square = None
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         self.is_playing = False
-                        self.reinitialise_game()
+                        back_to_menu = True
                     if event.key == pygame.K_c:
-                        if not coup:
-                            if list_coup:
-                                coup.append(list_coup.pop(len(list_coup)-1)[0])
-                        else:
-                            coup = []
                         cancel_move(self)
+                    if event.key == pygame.K_v:
+                        redo_move(self)
+                    if event.key == pygame.K_HOME:
+                        go_to_ply(self, 0)
+                    if event.key == pygame.K_END:
+                        go_to_ply(self, self.chess.last_ply())
                     if event.key == pygame.K_r:
                         self.reverse = not self.reverse
                         draw_board(self.screen, self)
@@ -332,10 +284,11 @@ class Game:
 
 
             pygame.display.flip()
-        if coup:
-            list_coup.append(coup)
-        create_pgn(list_coup, -self.turn, self)
+        create_pgn(self)
         self.stop_time()
+        # The game is saved before being reset for the next one
+        if back_to_menu:
+            self.reinitialise_game()
 
 
     def set_board_color(self,color):
@@ -356,22 +309,3 @@ class Game:
         if self.draw:
             end = True
         return end
-
-    def pieces_remaining(self):
-        pieces = []
-        for y in range(8):
-            for x in range(8):
-                piece = self.board[y][x]
-                if piece is not None:
-                    pieces.append(piece.type_piece)
-        return pieces
-
-
-
-
-
-
-
-
-
-
@@ -487,7 +487,7 @@ def mode_selecting(game, screen):
                     if rect.collidepoint(event.pos):
                         # Set time control based on selected mode
                         if mode == "1 min":
-                            game.set_time(ONE_MIN)
+                            game.set_mode(ONE_MIN)
                             mode_selected = True
                         elif mode == "1 | 1":
                             game.set_mode(ONE_MIN, 1)
@@ -679,6 +679,9 @@ def End_banner(game, screen):
         elif game.outcome == THREEFOLD:
             title_surf = font_title.render("Threefold repetition", True, white)
             score_text = font_score.render("1/2-1/2", True, black)
+        elif game.outcome == FIFTY_MOVES:
+            title_surf = font_title.render("Fifty-move rule", True, white)
+            score_text = font_score.render("1/2-1/2", True, black)
         else:
             title_surf = font_title.render("Draw", True, white)
             score_text = font_score.render("1/2-1/2", True, black)
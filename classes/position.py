@@ -0,0 +1,446 @@
+import random
+from array import array
+
+from utils.constante import *
+from utils.bitboard import *
+from utils.pst import *
+from utils.moves import *
+
+# Zobrist keys, drawn from a fixed seed so hashes are the same on every run
+_zobrist_random = random.Random(2024)
+ZOBRIST_PIECE = [[[_zobrist_random.getrandbits(64) for _ in range(64)] for _ in range(7)] for _ in range(3)]
+ZOBRIST_CASTLING = [_zobrist_random.getrandbits(64) for _ in range(16)]
+ZOBRIST_EP_FILE = [_zobrist_random.getrandbits(64) for _ in range(8)]
+ZOBRIST_TURN = _zobrist_random.getrandbits(64)
+
+# Castling rights lost when a piece leaves or lands on a square
+CASTLING_MASK = [15] * 64
+CASTLING_MASK[square(4, 7)] = 15 & ~(WHITE_KING_SIDE | WHITE_QUEEN_SIDE)
+CASTLING_MASK[square(7, 7)] = 15 & ~WHITE_KING_SIDE
+CASTLING_MASK[square(0, 7)] = 15 & ~WHITE_QUEEN_SIDE
+CASTLING_MASK[square(4, 0)] = 15 & ~(BLACK_KING_SIDE | BLACK_QUEEN_SIDE)
+CASTLING_MASK[square(7, 0)] = 15 & ~BLACK_KING_SIDE
+CASTLING_MASK[square(0, 0)] = 15 & ~BLACK_QUEEN_SIDE
+
+# Material key: the number of pieces of every color and type, packed in 4 bits each
+MATERIAL_KEY_WEIGHT = [None] * 3
+MATERIAL_KEY_WEIGHT[WHITE] = [0] + [1 << (4 * (piece_type - 1)) for piece_type in range(PAWN, KING + 1)]
+MATERIAL_KEY_WEIGHT[BLACK] = [0] + [1 << (4 * (piece_type + 5)) for piece_type in range(PAWN, KING + 1)]
+
+
+def material_key(white_pieces, black_pieces):
+    """
+    Material key of a set of pieces.
+
+    Args:
+        white_pieces (list): Types of the white pieces
+        black_pieces (list): Types of the black pieces
+
+    Returns:
+        int: The material key
+    """
+    key = 0
+    for color, pieces in ((WHITE, white_pieces), (BLACK, black_pieces)):
+        for piece_type in pieces:
+            key += MATERIAL_KEY_WEIGHT[color][piece_type]
+    return key
+
+
+# Same cases as Game.insufficient_material: kings alone, with one minor piece or with two bishops
+INSUFFICIENT_MATERIAL_KEYS = {
+    material_key([KING] + white, [KING] + black)
+    for white, black in (([], []),
+                         ([BISHOP], []), ([], [BISHOP]),
+                         ([KNIGHT], []), ([], [KNIGHT]),
+                         ([BISHOP, BISHOP], []), ([BISHOP], [BISHOP]), ([], [BISHOP, BISHOP]))
+}
+
+
+class Position:
+    """
+    Bitboard position of the game, also copied and played on by the AI search.
+
+    Every color owns one bitboard per piece type and one occupancy bitboard.
+    `squares` keeps the piece of every square as color * piece_type (EMPTY when free)
+    in a signed byte array, so the piece on a square can be read without testing the
+    twelve bitboards and the whole board is copied in one slice.
+    Material and piece-square scores (middlegame and endgame, positive for White) and
+    the game phase are updated with every piece added or removed, like the material key
+    counting the pieces of every color and type.
+    """
+    __slots__ = ('pieces', 'occupancy', 'squares', 'turn', 'castling', 'ep_square', 'halfmove', 'nb_turn',
+                 'last_move', 'hash_history', 'hash_counts', 'hash', 'mg_score', 'eg_score', 'phase', 'material_key')
+
+    def __init__(self):
+        self.pieces = [[0] * 7 for _ in range(3)]
+        self.occupancy = [0, 0, 0]
+        self.squares = array('b', bytes(64))
+        self.turn = WHITE
+        self.castling = 0
+        self.ep_square = None
+        self.halfmove = 0
+        self.nb_turn = 1
+        self.last_move = None
+        # Zobrist keys of every position of the game up to this one, and how many times each occurred
+        self.hash_history = []
+        self.hash_counts = {}
+        self.hash = 0
+        self.mg_score = 0
+        self.eg_score = 0
+        self.phase = 0
+        self.material_key = 0
+
+    @classmethod
+    def from_fen(cls, fen):
+        """
+        Build a position from a FEN string.
+
+        Args:
+            fen (str): The position in Forsyth-Edwards notation
+
+        Returns:
+            Position: The described position
+        """
+        fields = fen.split()
+        position = cls()
+        for y, row in enumerate(fields[0].split('/')):
+            x = 0
+            for char in row:
+                if char.isdigit():
+                    x += int(char)
+                else:
+                    color = WHITE if char.isupper() else BLACK
+                    position.add_piece(square(x, y), color, FEN_PIECE_TYPES[char.lower()])
+                    x += 1
+
+        position.turn = WHITE if fields[1] == 'w' else BLACK
+        for char, right in zip(FEN_CASTLING, (WHITE_KING_SIDE, WHITE_QUEEN_SIDE, BLACK_KING_SIDE, BLACK_QUEEN_SIDE)):
+            if char in fields[2]:
+                position.castling |= right
+        # A right is kept only with its king and rook on their starting squares
+        for color, y in ((WHITE, 7), (BLACK, 0)):
+            for x, piece_type in ((4, KING), (7, ROOK), (0, ROOK)):
+                if not position.pieces[color][piece_type] & SQUARE_BB[square(x, y)]:
+                    position.castling &= CASTLING_MASK[square(x, y)]
+        if fields[3] != '-':
+            position.ep_square = square(COLUMNS.index(fields[3][0]), ROWS.index(fields[3][1]))
+        if len(fields) > 5:
+            position.halfmove = int(fields[4])
+            position.nb_turn = int(fields[5])
+        position.hash = position.compute_hash()
+        position.hash_history = [position.hash]
+        position.hash_counts = {position.hash: 1}
+        return position
+
+    def to_fen(self):
+        """
+        Describe the position as a FEN string.
+
+        Returns:
+            str: The position in Forsyth-Edwards notation
+        """
+        rows = []
+        for y in range(8):
+            row = ""
+            empty = 0
+            for x in range(8):
+                code = self.squares[square(x, y)]
+                if code == EMPTY:
+                    empty += 1
+                    continue
+                if empty:
+                    row += str(empty)
+                    empty = 0
+                letter = FEN_PIECE_LETTERS[abs(code)]
+                row += letter.upper() if code > 0 else letter
+            if empty:
+                row += str(empty)
+            rows.append(row)
+
+        castling = "".join(char for char, right in zip(FEN_CASTLING, (WHITE_KING_SIDE, WHITE_QUEEN_SIDE,
+                                                                       BLACK_KING_SIDE, BLACK_QUEEN_SIDE))
+                           if self.castling & right) or "-"
+        if self.ep_square is None:
+            ep = "-"
+        else:
+            ep = COLUMNS[self.ep_square % 8] + ROWS[self.ep_square // 8]
+        turn = 'w' if self.turn == WHITE else 'b'
+        return f"{'/'.join(rows)} {turn} {castling} {ep} {self.halfmove} {self.nb_turn}"
+
+    def copy(self):
+        new = Position.__new__(Position)
+        new.pieces = [bbs[:] for bbs in self.pieces]
+        new.occupancy = self.occupancy[:]
+        new.squares = self.squares[:]
+        new.turn = self.turn
+        new.castling = self.castling
+        new.ep_square = self.ep_square
+        new.halfmove = self.halfmove
+        new.nb_turn = self.nb_turn
+        new.last_move = self.last_move
+        new.hash_history = self.hash_history[:]
+        new.hash_counts = dict(self.hash_counts)
+        new.hash = self.hash
+        new.mg_score = self.mg_score
+        new.eg_score = self.eg_score
+        new.phase = self.phase
+        new.material_key = self.material_key
+        return new
+
+    def compute_hash(self):
+        """
+        Compute the Zobrist key of the position from scratch.
+        make_move and unmake_move keep self.hash up to date incrementally.
+        """
+        key = ZOBRIST_CASTLING[self.castling]
+        for sq in range(64):
+            code = self.squares[sq]
+            if code != EMPTY:
+                color = WHITE if code > 0 else BLACK
+                key ^= ZOBRIST_PIECE[color][code * color][sq]
+        key ^= self.ep_key(self.ep_square, self.turn)
+        if self.turn == BLACK:
+            key ^= ZOBRIST_TURN
+        return key
+
+    def ep_key(self, ep_square, color):
+        """
+        Zobrist key of an en passant square. It is only part of the hash when a pawn of the
+        side to move can take there, otherwise the position repeats whatever the last move.
+
+        Args:
+            ep_square (int): En passant square, None if there is none
+            color (int): Side to move
+
+        Returns:
+            int: The key of the en passant file, 0 when no capture is possible
+        """
+        if ep_square is not None and PAWN_ATTACKS[-color][ep_square] & self.pieces[color][PAWN]:
+            return ZOBRIST_EP_FILE[ep_square % 8]
+        return 0
+
+    def add_piece(self, sq, color, piece_type):
+        bit = SQUARE_BB[sq]
+        self.pieces[color][piece_type] |= bit
+        self.occupancy[color] |= bit
+        self.squares[sq] = color * piece_type
+        self.hash ^= ZOBRIST_PIECE[color][piece_type][sq]
+        self.mg_score += PST_MG[color][piece_type][sq]
+        self.eg_score += PST_EG[color][piece_type][sq]
+        self.phase += PHASE_WEIGHT[piece_type]
+        self.material_key += MATERIAL_KEY_WEIGHT[color][piece_type]
+
+    def remove_piece(self, sq):
+        """
+        Remove the piece standing on a square.
+
+        Returns:
+            int: The removed piece as color * piece_type, EMPTY if the square was free
+        """
+        code = self.squares[sq]
+        if code != EMPTY:
+            color = WHITE if code > 0 else BLACK
+            piece_type = code * color
+            bit = SQUARE_BB[sq]
+            self.pieces[color][piece_type] ^= bit
+            self.occupancy[color] ^= bit
+            self.squares[sq] = EMPTY
+            self.hash ^= ZOBRIST_PIECE[color][piece_type][sq]
+            self.mg_score -= PST_MG[color][piece_type][sq]
+            self.eg_score -= PST_EG[color][piece_type][sq]
+            self.phase -= PHASE_WEIGHT[piece_type]
+            self.material_key -= MATERIAL_KEY_WEIGHT[color][piece_type]
+        return code
+
+    def occupied(self):
+        return self.occupancy[WHITE] | self.occupancy[BLACK]
+
+    def king_square(self, color):
+        king = self.pieces[color][KING]
+        if not king:
+            return None
+        return lsb(king)
+
+    def attackers(self, sq, color, occupancy=None):
+        """
+        Pieces of a color attacking a square.
+
+        Args:
+            sq (int): Target square
+            color (int): Color of the attacking side
+            occupancy (int): Occupancy used for sliding pieces, the current one by default
+
+        Returns:
+            int: Bitboard of the attacking pieces
+        """
+        if occupancy is None:
+            occupancy = self.occupancy[WHITE] | self.occupancy[BLACK]
+        bbs = self.pieces[color]
+        return ((KNIGHT_ATTACKS[sq] & bbs[KNIGHT])
+                | (KING_ATTACKS[sq] & bbs[KING])
+                | (PAWN_ATTACKS[-color][sq] & bbs[PAWN])
+                | (rook_attacks(sq, occupancy) & (bbs[ROOK] | bbs[QUEEN]))
+                | (bishop_attacks(sq, occupancy) & (bbs[BISHOP] | bbs[QUEEN])))
+
+    def is_attacked(self, sq, color):
+        return self.attackers(sq, color) != 0
+
+    def has_insufficient_material(self):
+        return self.material_key in INSUFFICIENT_MATERIAL_KEYS
+
+    def is_repetition(self):
+        """
+        Tell whether the position already occurred since the last capture or pawn move.
+        Only the positions with the same side to move are compared, one key out of two.
+
+        Returns:
+            bool: True if the key of the position is found in that part of the history
+        """
+        history = self.hash_history
+        key = self.hash
+        current = len(history) - 1
+        for index in range(current - 4, max(current - self.halfmove, 0) - 1, -2):
+            if history[index] == key:
+                return True
+        return False
+
+    def build_move(self, origin, destination, promotion=QUEEN):
+        """
+        Encode a move of this position, its flags are read from the board.
+
+        Args:
+            origin (int): Square of the moving piece
+            destination (int): Destination square
+            promotion (int): Piece a pawn reaching the last rank promotes to
+
+        Returns:
+            int: The encoded move
+        """
+        piece_type = abs(self.squares[origin])
+        flags = CAPTURE_FLAG if self.squares[destination] != EMPTY else 0
+        if piece_type == PAWN:
+            if destination == self.ep_square:
+                flags |= EN_PASSANT_FLAG
+            if destination < 8 or destination >= 56:
+                return encode_move(origin, destination, promotion, flags)
+        elif piece_type == KING and destination - origin in (2, -2):
+            flags |= CASTLE_FLAG
+        return encode_move(origin, destination, EMPTY, flags)
+
+    def make_move(self, move):
+        """
+        Play an encoded move in place. Castling, en passant and promotion are read from its flags.
+
+        Args:
+            move (int): The encoded move
+
+        Returns:
+            tuple: Undo record (move, moved piece, captured piece, castling, en passant square,
+                   halfmove clock, last move, hash) for unmake_move
+        """
+        origin = move & MOVE_SQUARE_MASK
+        destination = (move >> MOVE_TO_SHIFT) & MOVE_SQUARE_MASK
+        squares = self.squares
+        code = squares[origin]
+        color = WHITE if code > 0 else BLACK
+        piece_type = code * color
+        captured = squares[destination]
+        ep_square = self.ep_square
+        undo = (move, code, captured, self.castling, ep_square, self.halfmove, self.last_move, self.hash)
+
+        # Pieces update the key in add_piece/remove_piece, the rest is updated here
+        self.hash ^= ZOBRIST_CASTLING[self.castling] ^ ZOBRIST_TURN ^ self.ep_key(ep_square, color)
+        self.ep_square = None
+        self.castling &= CASTLING_MASK[origin] & CASTLING_MASK[destination]
+        self.hash ^= ZOBRIST_CASTLING[self.castling]
+        if piece_type == PAWN or captured != EMPTY:
+            self.halfmove = 0
+        else:
+            self.halfmove += 1
+        self.remove_piece(origin)
+        if captured != EMPTY:
+            self.remove_piece(destination)
+
+        if move & EN_PASSANT_FLAG:
+            # The captured pawn stands next to the origin square
+            self.remove_piece(origin - origin % 8 + destination % 8)
+        elif move & CASTLE_FLAG:
+            # The rook jumps over the king
+            if destination > origin:
+                self.remove_piece(origin + 3)
+                self.add_piece(origin + 1, color, ROOK)
+            else:
+                self.remove_piece(origin - 4)
+                self.add_piece(origin - 1, color, ROOK)
+        elif piece_type == PAWN and destination - origin in (16, -16):
+            self.ep_square = (origin + destination) // 2
+            self.hash ^= self.ep_key(self.ep_square, -color)
+        promotion = (move >> MOVE_PROMOTION_SHIFT) & MOVE_PROMOTION_MASK
+        if promotion:
+            piece_type = promotion
+
+        self.add_piece(destination, color, piece_type)
+
+        self.last_move = move
+        self.hash_history.append(self.hash)
+        self.hash_counts[self.hash] = self.hash_counts.get(self.hash, 0) + 1
+        self.turn = -self.turn
+        if self.turn == WHITE:
+            self.nb_turn += 1
+        return undo
+
+    def unmake_move(self, undo):
+        """
+        Take back the move described by an undo record returned by make_move.
+        """
+        move, code, captured, castling, ep_square, halfmove, last_move, key = undo
+        origin = move & MOVE_SQUARE_MASK
+        destination = (move >> MOVE_TO_SHIFT) & MOVE_SQUARE_MASK
+        color = WHITE if code > 0 else BLACK
+        piece_type = code * color
+
+        self.remove_piece(destination)
+        self.add_piece(origin, color, piece_type)
+        if captured != EMPTY:
+            self.add_piece(destination, -color, captured * -color)
+        elif move & EN_PASSANT_FLAG:
+            self.add_piece(origin - origin % 8 + destination % 8, -color, PAWN)
+        elif move & CASTLE_FLAG:
+            if destination > origin:
+                self.remove_piece(origin + 1)
+                self.add_piece(origin + 3, color, ROOK)
+            else:
+                self.remove_piece(origin - 1)
+                self.add_piece(origin - 4, color, ROOK)
+
+        if self.turn == WHITE:
+            self.nb_turn -= 1
+        self.turn = -self.turn
+        self.castling = castling
+        self.ep_square = ep_square
+        self.halfmove = halfmove
+        self.last_move = last_move
+        self.hash = key
+        last_key = self.hash_history.pop()
+        self.hash_counts[last_key] -= 1
+
+    def make_null_move(self):
+        """
+        Pass the turn without moving, used by the null move pruning of the search.
+
+        Returns:
+            tuple: Undo record (en passant square, halfmove clock, hash) for unmake_null_move
+        """
+        undo = (self.ep_square, self.halfmove, self.hash)
+        self.hash ^= self.ep_key(self.ep_square, self.turn) ^ ZOBRIST_TURN
+        self.ep_square = None
+        # A repetition across a null move is not a real one, the clock starts again
+        self.halfmove = 0
+        self.hash_history.append(self.hash)
+        self.turn = -self.turn
+        return undo
+
+    def unmake_null_move(self, undo):
+        self.ep_square, self.halfmove, self.hash = undo
+        self.hash_history.pop()
+        self.turn = -self.turn
@@ -1,25 +1,55 @@
-class Stack():
+# Index of the fields in an undo record of the move history
+RECORD_MOVE = 0         # Encoded move
+RECORD_UNDO = 1         # Undo record of the game position: castling rights, en passant square,
+                        # halfmove clock and hash before the move
+RECORD_SAN = 2          # Standard algebraic notation of the move
+
+
+class MoveHistory:
+    """
+    Moves of the game with their undo records, without any size limit.
+
+    The records before `ply` are the moves played on the board. The ones after it are
+    moves that were cancelled and can be played again: they are kept until another move
+    is pushed, and pushing the move they hold simply moves forward over them.
+    """
     def __init__(self):
-        self.items = []
+        self.records = []
+        self.ply = 0
+
+    def __len__(self):
+        return self.ply
 
     def is_empty(self):
-        return self.items == []
+        return self.ply == 0
 
-    def push(self, item):
-        self.items.append(item)
-        if len(self.items) >10:
-            self.items.pop(0)
+    def push(self, record):
+        if self.ply < len(self.records) and self.records[self.ply][RECORD_MOVE] == record[RECORD_MOVE]:
+            # The cancelled move is played again, the moves after it can still be redone
+            self.records[self.ply] = record
+        else:
+            del self.records[self.ply:]
+            self.records.append(record)
+        self.ply += 1
 
     def pop(self):
-        if self.is_empty():
+        if self.ply == 0:
             return None
-        else:
-            return self.items.pop()
+        self.ply -= 1
+        return self.records[self.ply]
+
     def peek(self):
-        if self.is_empty():
+        if self.ply == 0:
             return None
-        else:
-            return self.items[len(self.items) - 1]
-
+        return self.records[self.ply - 1]
 
+    def next_record(self):
+        """
+        Record of the next move that can be redone, None if there is none.
+        """
+        if self.ply == len(self.records):
+            return None
+        return self.records[self.ply]
 
+    def moves(self):
+        return [record[RECORD_MOVE] for record in self.records[:self.ply]]
@@ -0,0 +1,69 @@
+from utils.constante import *
+
+# Index of the fields in a transposition table entry
+TT_KEY = 0
+TT_DEPTH = 1
+TT_SCORE = 2
+TT_FLAG = 3
+TT_MOVE = 4
+TT_GENERATION = 5
+
+
+class TranspositionTable:
+    """
+    Fixed size table of search results indexed by the Zobrist key of the position.
+
+    Each slot holds one (key, depth, score, flag, best_move, generation) tuple.
+    A slot is overwritten when it is empty, holds the same position, comes from an
+    older search or was searched less deeply than the new result.
+    """
+    def __init__(self, size_mb=TT_SIZE_MB):
+        self.generation = 0
+        self.resize(size_mb)
+
+    def resize(self, size_mb):
+        # The number of slots is a power of two so the index is a simple mask
+        count = max(1, int(size_mb * 1024 * 1024) // TT_ENTRY_SIZE)
+        self.size = 1 << (count.bit_length() - 1)
+        self.mask = self.size - 1
+        self.entries = [None] * self.size
+
+    def clear(self):
+        self.entries = [None] * self.size
+        self.generation = 0
+
+    def new_search(self):
+        self.generation += 1
+
+    def probe(self, key):
+        """
+        Look up a position.
+
+        Args:
+            key (int): Zobrist key of the position
+
+        Returns:
+            tuple: The stored entry, or None if the position is not in the table
+        """
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[TT_KEY] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, score, flag, move):
+        """
+        Store a search result, following the replacement policy.
+
+        Args:
+            key (int): Zobrist key of the position
+            depth (int): Remaining depth the position was searched with
+            score (int): Score found by the search
+            flag (int): EXACT, LOWER_BOUND or UPPER_BOUND
+            move: Best move found, None if there is none
+        """
+        index = key & self.mask
+        entry = self.entries[index]
+        if entry is None or entry[TT_KEY] == key or entry[TT_GENERATION] != self.generation or depth >= entry[TT_DEPTH]:
+            if move is None and entry is not None and entry[TT_KEY] == key:
+                move = entry[TT_MOVE]
+            self.entries[index] = (key, depth, score, flag, move, self.generation)
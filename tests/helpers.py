@@ -0,0 +1,53 @@
+from classes.chess_game import *
+
+KIWIPETE_FEN = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+
+def play(game, *moves):
+    """
+    Push moves given as "e2e4", the origin and destination squares, "e7e8n" to promote.
+    """
+    for text in moves:
+        origin = square(COLUMNS.index(text[0]), ROWS.index(text[1]))
+        destination = square(COLUMNS.index(text[2]), ROWS.index(text[3]))
+        promotion = FEN_PIECE_TYPES[text[4]] if len(text) > 4 else QUEEN
+        game.push(game.position.build_move(origin, destination, promotion))
+
+
+def perft(position, depth):
+    """
+    Count the leaves of the legal move tree.
+    """
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in generate_legal_moves(position, position.turn):
+        undo = position.make_move(move)
+        nodes += perft(position, depth - 1)
+        position.unmake_move(undo)
+    return nodes
+
+
+def alpha_beta(ai, position, depth, alpha, beta, ply=0):
+    """
+    Plain fail-soft alpha-beta, without move ordering nor pruning, ending with the quiescence
+    search of the AI. Scores are seen from the side to move, like AI.negamax.
+    """
+    if ply > 0 and position.is_repetition():
+        return 0
+    if depth == 0:
+        return ai.quiescence(position, alpha, beta, ply)
+    moves = generate_legal_moves(position, position.turn)
+    if not moves:
+        return -(MATE_SCORE - ply) if is_check_simu(position, position.turn) else 0
+    best = -INFINITE_SCORE
+    for move in moves:
+        undo = position.make_move(move)
+        score = -alpha_beta(ai, position, depth - 1, -beta, -alpha, ply + 1)
+        position.unmake_move(undo)
+        if score > best:
+            best = score
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+    return best
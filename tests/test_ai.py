@@ -0,0 +1,67 @@
+import random
+
+from tests.helpers import *
+from classes.AI import *
+
+
+def search(fen, depth):
+    ai = AI(ChessGame(fen), randomize=False)
+    ai.get_best_move(depth=depth)
+    return ai
+
+
+def test_mate_in_one_for_black():
+    ai = search("r5k1/8/8/8/8/8/5PPP/6K1 b - - 0 1", 3)
+    assert ai.best_score == MATE_SCORE - 1
+
+
+def test_shortest_mate_in_three():
+    fen = "4k3/8/8/4K3/8/8/8/R7 w - - 0 1"
+    ai = search(fen, 6)
+    assert ai.best_score == MATE_SCORE - 5
+    game = ChessGame(fen)
+    for move in ai.principal_variation:
+        game.push(move)
+    assert game.outcome() == BLACK_CHECKMATE
+    # No mate in two
+    assert search(fen, 4).best_score < MATE_BOUND
+
+
+def test_position_repeated_in_the_line():
+    game = ChessGame()
+    play(game, "g1f3", "g8f6", "f3g1")
+    assert not game.position.is_repetition()
+    play(game, "f6g8")
+    assert game.position.is_repetition()
+    play(game, "e2e4", "g8f6", "g1f3", "f6g8")
+    assert not game.position.is_repetition()
+    # The position after 1.e4 comes back
+    play(game, "f3g1")
+    assert game.position.is_repetition()
+
+
+def test_perpetual_check_scored_as_draw():
+    # White is a queen and a rook down and mated by Qxg2 unless it keeps checking
+    for fen in ("7k/5Q2/5ppp/8/8/8/rq4PP/7K w - - 0 1", "4Q3/6pk/8/8/8/8/rq4PP/7K w - - 0 1"):
+        for depth in (4, 6):
+            ai = search(fen, depth)
+            assert ai.best_score == 0
+            assert ChessGame(fen).san(ai.best_move).endswith("+")
+
+
+def test_principal_variation_search_matches_alpha_beta():
+    rng = random.Random(7)
+    for _ in range(3):
+        game = ChessGame()
+        for ply in range(12):
+            if game.is_over():
+                break
+            if ply % 2 == 1:
+                # Null moves and reductions change the tree, the exact scores must match without them
+                ai = AI(game, randomize=False)
+                ai.null_move_min_depth = ai.lmr_min_depth = MAX_DEPTH
+                ai.get_best_move(depth=3)
+                reference = alpha_beta(AI(game, randomize=False), game.position.copy(), 3,
+                                       -INFINITE_SCORE, INFINITE_SCORE)
+                assert ai.best_score == reference
+            game.push(rng.choice(game.legal_moves()))
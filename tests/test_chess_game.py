@@ -0,0 +1,158 @@
+import random
+
+import pytest
+
+from tests.helpers import *
+
+
+def test_perft_start_position():
+    position = Position.from_fen(START_FEN)
+    assert [perft(position, depth) for depth in (1, 2, 3)] == [20, 400, 8902]
+
+
+def test_perft_kiwipete():
+    position = Position.from_fen(KIWIPETE_FEN)
+    assert [perft(position, depth) for depth in (1, 2, 3)] == [48, 2039, 97862]
+
+
+@pytest.mark.parametrize("fen", [
+    START_FEN,
+    KIWIPETE_FEN,
+    "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "4k3/8/8/8/8/8/R7/4K3 b - - 37 52",
+])
+def test_fen_round_trip(fen):
+    assert ChessGame(fen).fen() == fen
+
+
+def test_push_pop_redo_round_trip():
+    random.seed(7)
+    game = ChessGame()
+    fens = [game.fen()]
+    for _ in range(60):
+        if game.is_over():
+            break
+        game.push(random.choice(game.legal_moves()))
+        fens.append(game.fen())
+    plies = len(game)
+
+    for index in range(plies):
+        game.pop()
+        assert game.fen() == fens[-2 - index]
+    assert game.fen() == START_FEN
+    assert game.pop() is None
+
+    for index in range(plies):
+        game.redo()
+        assert game.fen() == fens[index + 1]
+    assert game.next_move() is None
+
+
+def test_push_illegal_move():
+    game = ChessGame()
+    with pytest.raises(ValueError):
+        play(game, "e2e5")
+    assert game.fen() == START_FEN
+
+
+def test_underpromotion():
+    game = ChessGame("8/1P5k/8/8/8/8/P7/K7 w - - 0 1")
+    play(game, "b7b8n")
+    assert game.fen() == "1N6/7k/8/8/8/8/P7/K7 b - - 0 1"
+    assert game.pgn().endswith("1. b8=N *")
+
+
+def test_outcome_checkmate():
+    game = ChessGame()
+    play(game, "f2f3", "e7e5", "g2g4")
+    assert game.outcome() == GAME_IN_PROGRESS
+    play(game, "d8h4")
+    assert game.outcome() == WHITE_CHECKMATE
+    assert game.legal_moves() == []
+
+
+def test_outcome_stalemate():
+    assert ChessGame("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1").outcome() == STALEMATE
+
+
+def test_outcome_insufficient_material():
+    assert ChessGame("8/8/4k3/8/8/3NK3/8/8 w - - 0 1").outcome() == INSUFFICIENT
+    assert ChessGame("8/8/4k3/8/8/3RK3/8/8 w - - 0 1").outcome() == GAME_IN_PROGRESS
+
+
+def test_outcome_threefold_repetition():
+    game = ChessGame()
+    play(game, "g1f3", "g8f6", "f3g1", "f6g8", "g1f3", "g8f6", "f3g1")
+    assert game.outcome() == GAME_IN_PROGRESS
+    play(game, "f6g8")
+    assert game.outcome() == THREEFOLD
+    game.pop()
+    assert game.outcome() == GAME_IN_PROGRESS
+
+
+def test_outcome_fifty_moves():
+    game = ChessGame("4k3/8/8/8/8/8/R7/4K3 w - - 98 80")
+    play(game, "a2a3")
+    assert game.outcome() == GAME_IN_PROGRESS
+    play(game, "e8d7")
+    assert game.outcome() == FIFTY_MOVES
+
+
+def test_pgn():
+    game = ChessGame()
+    play(game, "f2f3", "e7e5", "g2g4", "d8h4")
+    assert game.pgn() == ('[Event ""]\n'
+                          '[Site ""]\n'
+                          '[Date ""]\n'
+                          '[Round ""]\n'
+                          '[White "Player_1"]\n'
+                          '[Black "Player_2"]\n'
+                          '[Result "0-1"]\n'
+                          f'[FEN "{START_FEN}"]\n'
+                          '1. f3 e5 2. g4 Qh4# 0-1')
+
+
+def test_pgn_from_black_to_move():
+    game = ChessGame("4k3/8/8/8/8/8/R7/4K3 b - - 0 12")
+    play(game, "e8d8", "a2a8")
+    assert game.pgn(result="1-0", white="A", black="B").endswith('[White "A"]\n[Black "B"]\n'
+                                                                '[Result "1-0"]\n'
+                                                                '[FEN "4k3/8/8/8/8/8/R7/4K3 b - - 0 12"]\n'
+                                                                '12... Kd8 13. Ra8+ 1-0')
+
+
+def test_san_disambiguation():
+    game = ChessGame("k7/8/8/8/8/1N3N2/8/K2N4 w - - 0 1")
+    assert sorted(game.san(move) for move in game.legal_moves()
+                  if move_to(move) in (square(3, 4), square(3, 6))) == ["Nbd2", "Nbd4", "Nfd2", "Nfd4"]
+    game = ChessGame("8/8/7Q/k7/8/8/8/K6Q w - - 0 1")
+    assert sorted(game.san(move) for move in game.legal_moves()
+                  if move_to(move) == square(7, 5)) == ["Q1h3", "Q6h3"]
+
+
+def test_go_to_ply():
+    game = ChessGame()
+    play(game, "e2e4", "e7e5", "g1f3", "b8c6", "f1b5")
+    fens = []
+    for ply in range(6):
+        game.go_to_ply(ply)
+        assert len(game) == ply
+        fens.append(game.fen())
+    assert fens[0] == START_FEN
+
+    game.go_to_ply(2)
+    assert game.fen() == fens[2]
+    assert game.last_ply() == 5
+    game.go_to_ply(5)
+    assert game.fen() == fens[5]
+    # Past the moves known, the game stays on the last one
+    game.go_to_ply(9)
+    assert len(game) == 5
+
+    # Another move played after going back forgets the moves after it
+    game.go_to_ply(1)
+    play(game, "c7c5")
+    assert game.last_ply() == 2
+    game.go_to_ply(4)
+    assert len(game) == 2
@@ -0,0 +1,50 @@
+from tests.helpers import *
+
+
+def test_hash_matches_full_computation():
+    game = ChessGame()
+    play(game, "e2e4", "d7d5", "e4e5", "f7f5", "e5f6", "g8f6", "e1e2")
+    assert game.position.hash == game.position.compute_hash()
+    while game.pop() is not None:
+        assert game.position.hash == game.position.compute_hash()
+    assert game.position.hash == ChessGame().position.hash
+
+
+def test_en_passant_square_hashed_only_when_capture_possible():
+    # No black pawn can take on e3: same key as the position reached without a double step
+    assert (Position.from_fen("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1").hash
+            == Position.from_fen("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1").hash)
+    # The pawn on d4 can take on e3
+    assert (Position.from_fen("rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1").hash
+            != Position.from_fen("rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1").hash)
+
+
+def test_threefold_repetition_after_double_pawn_push():
+    game = ChessGame()
+    play(game, "e2e4", "g8f6", "g1f3", "f6g8", "f3g1", "g8f6", "g1f3", "f6g8")
+    assert game.outcome() == GAME_IN_PROGRESS
+    # The position after 1.e4 with Black to move occurs for the third time
+    play(game, "f3g1")
+    assert game.outcome() == THREEFOLD
+
+
+def test_castling_rights_need_king_and_rook_at_home():
+    # No rook on h1
+    assert Position.from_fen("4k3/8/8/8/8/8/8/4K3 w K - 0 1").to_fen() == "4k3/8/8/8/8/8/8/4K3 w - - 0 1"
+    # King on d1
+    assert Position.from_fen("4k3/8/8/8/8/8/8/3K3R w K - 0 1").to_fen() == "4k3/8/8/8/8/8/8/3K3R w - - 0 1"
+    # Only the rights whose rook is missing are dropped
+    assert Position.from_fen("r3k3/8/8/8/8/8/8/R3K2R w KQkq - 0 1").to_fen() == "r3k3/8/8/8/8/8/8/R3K2R w KQq - 0 1"
+    game = ChessGame("4k3/8/8/8/8/8/8/4K3 w K - 0 1")
+    assert not any(move & CASTLE_FLAG for move in game.legal_moves())
+
+
+def test_remembered_move_valid_only_with_its_exact_flags():
+    position = Position.from_fen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    info = check_info(position, WHITE)
+    legal = set(generate_legal_moves(position, WHITE))
+    for move in legal:
+        assert is_valid_move_simu(position, info, move, WHITE)
+        for flag in (CAPTURE_FLAG, EN_PASSANT_FLAG, CASTLE_FLAG):
+            if move | flag != move:
+                assert not is_valid_move_simu(position, info, move | flag, WHITE)
@@ -0,0 +1,199 @@
+# bitboard.py - Bitboard helpers and precomputed attack tables for the AI
+
+from utils.constante import *
+
+# Squares are numbered like the board lists: index = y * 8 + x.
+# a8 is square 0, h8 is square 7 and h1 is square 63.
+# Lists indexed by color use WHITE (1) and BLACK (-1) directly, slot 0 is unused.
+
+SQUARE_BB = [1 << sq for sq in range(64)]
+BACK_RANKS = 0xFF | (0xFF << 56)    # 8th and 1st ranks, where pawns promote
+
+
+def square(x, y):
+    """
+    Convert board coordinates to a square index.
+
+    Args:
+        x (int): Column (0 = a)
+        y (int): Row (0 = 8th rank)
+
+    Returns:
+        int: Square index between 0 and 63
+    """
+    return y * 8 + x
+
+
+def lsb(bb):
+    """
+    Return the index of the least significant set bit of a bitboard.
+
+    Args:
+        bb (int): Non empty bitboard
+
+    Returns:
+        int: Square index of the lowest set bit
+    """
+    return (bb & -bb).bit_length() - 1
+
+
+def iter_bits(bb):
+    """
+    Iterate over the squares set in a bitboard, lowest square first.
+
+    Args:
+        bb (int): Bitboard
+
+    Yields:
+        int: Square index of every set bit
+    """
+    while bb:
+        bit = bb & -bb
+        yield bit.bit_length() - 1
+        bb ^= bit
+
+
+def popcount(bb):
+    """
+    Count the number of set bits of a bitboard.
+
+    Args:
+        bb (int): Bitboard
+
+    Returns:
+        int: Number of squares set
+    """
+    return bin(bb).count("1")
+
+
+def _on_board(x, y):
+    return 0 <= x < 8 and 0 <= y < 8
+
+
+def _jump_table(directions):
+    """
+    Build the attack set of a jumping piece for every square.
+    """
+    table = []
+    for sq in range(64):
+        x, y = sq % 8, sq // 8
+        bb = 0
+        for dx, dy in directions:
+            if _on_board(x + dx, y + dy):
+                bb |= SQUARE_BB[square(x + dx, y + dy)]
+        table.append(bb)
+    return table
+
+
+def _slide(sq, directions, occupancy):
+    """
+    Walk the rays of a sliding piece, stopping on the first occupied square.
+    """
+    bb = 0
+    for dx, dy in directions:
+        x, y = sq % 8 + dx, sq // 8 + dy
+        while _on_board(x, y):
+            bb |= SQUARE_BB[square(x, y)]
+            if occupancy & SQUARE_BB[square(x, y)]:
+                break
+            x += dx
+            y += dy
+    return bb
+
+
+def _line_table(directions):
+    """
+    Build the occupancy lookup of one line (rank, file, diagonal or anti-diagonal).
+
+    For every square the relevant mask holds the squares of the line that can block
+    the piece (edge squares never block anything). Every subset of that mask is then
+    mapped to its attack set, so a lookup is a single masked dict access.
+    Python's dict hashing plays the role of the magic multiplication.
+    """
+    masks = []
+    tables = []
+    for sq in range(64):
+        mask = 0
+        for dx, dy in directions:
+            x, y = sq % 8 + dx, sq // 8 + dy
+            while _on_board(x + dx, y + dy):
+                mask |= SQUARE_BB[square(x, y)]
+                x += dx
+                y += dy
+        table = {}
+        subset = 0
+        while True:
+            table[subset] = _slide(sq, directions, subset)
+            subset = (subset - mask) & mask
+            if subset == 0:
+                break
+        masks.append(mask)
+        tables.append(table)
+    return masks, tables
+
+
+KNIGHT_ATTACKS = _jump_table(KNIGHT_DIRECTION)
+KING_ATTACKS = _jump_table(KING_DIRECTION)
+PAWN_ATTACKS = [None, _jump_table(DIRECTIONS_WHITE_PAWN_2), _jump_table(DIRECTIONS_BLACK_PAWN_2)]
+
+RANK_MASK, RANK_ATTACKS = _line_table([(1, 0), (-1, 0)])
+FILE_MASK, FILE_ATTACKS = _line_table([(0, 1), (0, -1)])
+DIAG_MASK, DIAG_ATTACKS = _line_table([(1, 1), (-1, -1)])
+ANTI_DIAG_MASK, ANTI_DIAG_ATTACKS = _line_table([(1, -1), (-1, 1)])
+
+
+def _between_table():
+    """
+    Build BETWEEN[a][b]: the squares strictly between two squares on a same line, 0 if they are not aligned.
+    """
+    table = [[0] * 64 for _ in range(64)]
+    for a in range(64):
+        for dx, dy in KING_DIRECTION:
+            x, y = a % 8 + dx, a // 8 + dy
+            ray = 0
+            while _on_board(x, y):
+                table[a][square(x, y)] = ray
+                ray |= SQUARE_BB[square(x, y)]
+                x += dx
+                y += dy
+    return table
+
+
+BETWEEN = _between_table()
+
+
+def rook_attacks(sq, occupancy):
+    return RANK_ATTACKS[sq][occupancy & RANK_MASK[sq]] | FILE_ATTACKS[sq][occupancy & FILE_MASK[sq]]
+
+
+def bishop_attacks(sq, occupancy):
+    return DIAG_ATTACKS[sq][occupancy & DIAG_MASK[sq]] | ANTI_DIAG_ATTACKS[sq][occupancy & ANTI_DIAG_MASK[sq]]
+
+
+def queen_attacks(sq, occupancy):
+    return rook_attacks(sq, occupancy) | bishop_attacks(sq, occupancy)
+
+
+def piece_attacks(piece_type, sq, occupancy):
+    """
+    Squares attacked by a non pawn piece standing on a square.
+
+    Args:
+        piece_type (int): KNIGHT, BISHOP, ROOK, QUEEN or KING
+        sq (int): Square of the piece
+        occupancy (int): Bitboard of every occupied square
+
+    Returns:
+        int: Bitboard of the attacked squares
+    """
+    if piece_type == KNIGHT:
+        return KNIGHT_ATTACKS[sq]
+    elif piece_type == BISHOP:
+        return bishop_attacks(sq, occupancy)
+    elif piece_type == ROOK:
+        return rook_attacks(sq, occupancy)
+    elif piece_type == QUEEN:
+        return queen_attacks(sq, occupancy)
+    elif piece_type == KING:
+        return KING_ATTACKS[sq]
+    return 0
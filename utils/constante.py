@@ -279,6 +279,10 @@ DRAW = 4
 STALEMATE = 5
 INSUFFICIENT = 6
 THREEFOLD = 7
+FIFTY_MOVES = 8
+
+REPETITION_LIMIT = 3    #Occurrences of a same position that draw the game
+FIFTY_MOVE_LIMIT = 100    #Halfmoves without capture or pawn move that draw the game
 
 
 # === DIRECTIONS DE MOUVEMENT ===
@@ -329,18 +333,22 @@ THIRTY_MIN = 3 * TEN_MIN
 
 ONE_HOUR = 2 * THIRTY_MIN
 
-#========== STATE BORD GESTION ===========#
+#========== FEN ===========#
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+FEN_PIECE_LETTERS = {PAWN: 'p', ROOK: 'r', KNIGHT: 'n', BISHOP: 'b', QUEEN: 'q', KING: 'k'}
+FEN_PIECE_TYPES = {letter: piece_type for piece_type, letter in FEN_PIECE_LETTERS.items()}
+FEN_CASTLING = "KQkq"    #Castling letters in the order of the rights below
 
-PIECE_TYPE =  0    #Index of the piece type in the state_copy data structure and in the last_move_info dict
-PIECE_COLOR = 1    #Index of the piece color in the state_copy data structure
-PIECE_MOVEMENT = 2    #Index of the piece movement in the state_copy data structure
-PIECE_NB_MOVEMENT = 3    #Index of the piece number of move in the state_copy data structure
-FROM_X = 1    #Index of the x pos in the last_move_info dict
-FROM_Y = 2    #Index of the y pos in the last_move_info dict
-TO_X = 3    #Index of the x des in the last_move_info dict
-TO_Y = 4    #Index of the y des in the last_move_info dict
 
 
+#========== CASTLING RIGHTS ===========#
+# Bit flags stored in the castling field of the AI position
+
+WHITE_KING_SIDE = 1
+WHITE_QUEEN_SIDE = 2
+BLACK_KING_SIDE = 4
+BLACK_QUEEN_SIDE = 8
 
 #==================== PIECE EVALUATION =======================#
 
@@ -351,6 +359,43 @@ PIECE_VALUE = {PAWN:100,
                 QUEEN:900,
                KING:20000}
 
+#==================== AI SEARCH =======================#
+
+TT_SIZE_MB = 16    # Default size of the transposition table
+TT_ENTRY_SIZE = 160    # Approximate memory used by one stored entry (bytes)
+MAX_DEPTH = 64    # Depth stored for terminal positions, never searched deeper
+MATE_SCORE = 1000000    # Score of a checkmate, minus the number of plies to reach it
+MATE_BOUND = MATE_SCORE - MAX_DEPTH    # Scores above this value are forced mates
+INFINITE_SCORE = MATE_SCORE + 1
+DELTA_MARGIN = 200    # Safety margin of the delta pruning in the quiescence search
+ASPIRATION_WINDOW = 50    # Half width of the window around the previous iteration's score
+ASPIRATION_MAX = 800    # Past this half width the window is opened completely
+
+# Selective search
+NULL_MOVE_REDUCTION = 2    # Depth saved by the null move search
+NULL_MOVE_MIN_DEPTH = 3    # No null move below this remaining depth
+NULL_MOVE_VERIFY_DEPTH = 5    # From this depth a null move cutoff is verified by a reduced search
+LMR_REDUCTION = 1    # Depth saved on a late quiet move
+LMR_MIN_DEPTH = 3    # No reduction below this remaining depth
+LMR_MIN_MOVES = 3    # Number of moves searched at full depth before reducing
+
+# Move ordering: hash move, captures, killer moves, then quiet moves by history score
+HASH_MOVE_PRIORITY = 1 << 30
+CAPTURE_PRIORITY = 1 << 28
+KILLER_PRIORITY = 1 << 26
+HISTORY_MAX = 1 << 24    # History scores are halved past this value
+
+# Time management of the AI (seconds)
+MOVES_TO_GO = 40    # Number of moves the remaining clock is shared between
+AI_MOVE_TIME = 2    # Time per move when the game has no clock
+MIN_MOVE_TIME = 0.05
+NODE_CHECK_INTERVAL = 64    # Number of nodes between two checks of the limits
+
+# Bound type of a transposition table score
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
 #================= PUZZLE ====================#
 
 MAT = [
@@ -3,7 +3,6 @@ import math
 
 from classes.AI import *
 from utils.constante import *
-from classes.stack import Stack
 
 # Global variable to track selected squares on the chessboard
 selected_case = [[False for _ in range(8)] for _ in range(8)]
@@ -106,97 +105,6 @@ def draw_board(screen, game, miniature=False, offset_x=OFFSET_PLATEAU_X, offset_
     return pygame.Rect(offset_x, offset_y, board_width, board_height)
 
 
-def is_collinear(v1, v2):
-    """
-    Check if two vectors are collinear (parallel or anti-parallel).
-
-    Args:
-        v1 (tuple): First vector (dx, dy)
-        v2 (tuple): Second vector (dx, dy)
-
-    Returns:
-        bool: True if vectors are collinear, False otherwise
-    """
-    # Cross product is zero for collinear vectors
-    return v1[0] * v2[1] - v1[1] * v2[0] == 0
-
-
-def is_legal_move(game, original_x, original_y, des_x, des_y, ignore_turn=False):
-    """
-    Check if a move is legal according to chess rules.
-
-    Args:
-        game (Game): The game instance
-        original_x (int): Starting x coordinate
-        original_y (int): Starting y coordinate
-        des_x (int): Destination x coordinate
-        des_y (int): Destination y coordinate
-        ignore_turn (bool): Whether to ignore whose turn it is
-
-    Returns:
-        bool: True if the move is legal, False otherwise
-    """
-    original = game.board[original_y][original_x]
-    destination = game.board[des_y][des_x]
-
-    # Calculate movement vector
-    d_x = des_x - original_x
-    d_y = des_y - original_y
-
-    # Check if it's the correct player's turn
-    if not ignore_turn:
-        if original.color != game.turn:
-            return False
-    valid_direction = False
-    # Check for castling moves
-    if original.type_piece == KING:
-        if (d_x,d_y) not in original.movement:
-            if (original.color == WHITE and (des_x, des_y) == QUEEN_SIDE_CASTLE[1]) or (original.color == BLACK and (des_x, des_y) == QUEEN_SIDE_CASTLE[0])  and original.nb_move == 0:
-                    return can_castle_queen_side(game, original.color)
-            elif (original.color == WHITE and (des_x, des_y) == KING_SIDE_CASTLE[1]) or (original.color == BLACK and (des_x, des_y) == KING_SIDE_CASTLE[0]) and original.nb_move == 0:
-                    return can_castle_king_side(game, original.color)
-
-    valid_direction = False
-
-    # Handle non-pawn pieces
-    if original.type_piece != PAWN:
-        if original.movement_type == SLIDING:
-            # For sliding pieces, check if move direction is valid
-            for direct in original.movement:
-                if is_collinear((d_x, d_y), direct):
-                    valid_direction = True
-                    break
-
-            # Check if path is clear for sliding pieces
-            if valid_direction:
-                step_x = (d_x // abs(d_x)) if d_x != 0 else 0
-                step_y = (d_y // abs(d_y)) if d_y != 0 else 0
-                x, y = original_x + step_x, original_y + step_y
-                while (x, y) != (des_x, des_y):
-                    if game.board[y][x] is not None:
-                        return False
-                    x += step_x
-                    y += step_y
-        else:
-            # For non-sliding pieces, move must be in allowed movement list
-            valid_direction = (d_x, d_y) in original.movement
-
-        # Check destination square
-        if destination is None:
-            return valid_direction
-
-        # Cannot capture own piece
-        if original.color == destination.color:
-            return False
-        elif valid_direction:
-            return True
-    else:
-        # Handle pawn moves separately
-        return is_legal_move_pawn(game, original_x, original_y, des_x, des_y)
-
-
-
-
 def show_possible_move(game, pos):
     """
     Display visual indicators for all legal moves from a given position.
@@ -209,149 +117,75 @@ def show_possible_move(game, pos):
     orig_y = pos[1]
     piece = game.board[orig_y][orig_x]
 
-    # Check all squares on the board
-    for y in range(8):
-        for x in range(8):
-            # If move is legal and safe (doesn't leave king in check)
-            if is_legal_move(game, orig_x, orig_y, x, y) and is_safe_move(game, orig_x, orig_y, x, y, game.turn):
-                piece_2 = game.board[y][x]
-                if game.reverse:
-                    pos_2 = chess_to_xy((7-x,7-y))
-                else:
-                    pos_2 = chess_to_xy((x, y))
-                top_left_x = pos_2[0] - CASE_SIZE // 2
-                top_left_y = pos_2[1] - CASE_SIZE // 2
-                circle_surf = pygame.Surface((CASE_SIZE, CASE_SIZE), pygame.SRCALPHA)
-
-                # Draw different indicators for capture vs normal move
-                if piece_2 is not None and piece.color != piece_2.color:
-                    # Red circle for capture moves
-                    pygame.draw.circle(circle_surf, COLOR_CHECK, (CASE_SIZE / 2, CASE_SIZE / 2), 35, width=3)
-                    game.screen.blit(circle_surf, (top_left_x, top_left_y))
-                else:
-                    # Small dot for normal moves
-                    pygame.draw.circle(circle_surf, SELECTION_COLOR_3, (CASE_SIZE / 2, CASE_SIZE / 2), 10)
-                    game.screen.blit(circle_surf, (top_left_x, top_left_y))
-
-
-def is_legal_move_pawn(game, orig_x, orig_y, des_x, des_y):
-    """
-    Check if a pawn move is legal according to pawn-specific rules.
-
-    Args:
-        game (Game): The game instance
-        orig_x (int): Origin x coordinate
-        orig_y (int): Origin y coordinate
-        des_x (int): Destination x coordinate
-        des_y (int): Destination y coordinate
-
-    Returns:
-        bool: True if the pawn move is legal, False otherwise
-    """
-    original = game.board[orig_y][orig_x]
-    destination = game.board[des_y][des_x]
-
-    # Calculate movement vector
-    d_x = des_x - orig_x
-    d_y = des_y - orig_y
-
-    # Check for en passant
-    if can_en_passant(game, orig_x, orig_y, des_x, des_y):
-        return True
-
-    # Check for diagonal capture
-    if destination is not None and destination.color != original.color:
-        if (d_x, d_y) in original.movement_2:
-            return True
-
-    # Determine allowed movements based on whether pawn has moved
-    if original.nb_move == 0:
-        valid_direction = (d_x, d_y) in original.movement_1  # Initial two-square move allowed
-    else:
-        valid_direction = (d_x, d_y) in original.movement  # Only one square forward
-
-    # Check if path is clear (for forward moves)
-    if valid_direction:
-        step_x = (d_x // abs(d_x)) if d_x != 0 else 0
-        step_y = (d_y // abs(d_y)) if d_y != 0 else 0
-        x, y = orig_x + step_x, orig_y + step_y
-        while (x, y) != (des_x, des_y):
-            if game.board[y][x] is not None:
-                return False
-            x += step_x
-            y += step_y
-
-    # Pawn can only move to empty square (for non-capture moves)
-    if destination is None:
-        return valid_direction
-
-    return False
-
-
+    if piece.color != game.turn:
+        return
 
+    # The legal destinations of the piece were computed when the turn started
+    for x, y in game.legal_moves.get((orig_x, orig_y), {}):
+        piece_2 = game.board[y][x]
+        if game.reverse:
+            pos_2 = chess_to_xy((7-x,7-y))
+        else:
+            pos_2 = chess_to_xy((x, y))
+        top_left_x = pos_2[0] - CASE_SIZE // 2
+        top_left_y = pos_2[1] - CASE_SIZE // 2
+        circle_surf = pygame.Surface((CASE_SIZE, CASE_SIZE), pygame.SRCALPHA)
+
+        # Draw different indicators for capture vs normal move
+        if piece_2 is not None and piece.color != piece_2.color:
+            # Red circle for capture moves
+            pygame.draw.circle(circle_surf, COLOR_CHECK, (CASE_SIZE / 2, CASE_SIZE / 2), 35, width=3)
+            game.screen.blit(circle_surf, (top_left_x, top_left_y))
+        else:
+            # Small dot for normal moves
+            pygame.draw.circle(circle_surf, SELECTION_COLOR_3, (CASE_SIZE / 2, CASE_SIZE / 2), 10)
+            game.screen.blit(circle_surf, (top_left_x, top_left_y))
 
 
-def king_pos(board, color):
+def king_pos(game, color):
     """
-    Find the position of the king of a given color on the board.
+    Position of the king of a given color, read from the bitboards of the game.
 
     Args:
-        board (list): 2D list representing the board
+        game (Game): The game instance
         color (int): Color of the king to find (WHITE or BLACK)
 
     Returns:
-        tuple: Position (x, y) of the king, or None if not found
+        tuple: Position (x, y) of the king, or None if there is no king of that color
     """
-    for y in range(8):
-        for x in range(8):
-            piece = board[y][x]
-            if piece is not None:
-                if piece.type_piece == KING and piece.color == color:
-                    return x, y
-
+    sq = game.position.king_square(color)
+    if sq is None:
+        return None
+    return sq % 8, sq // 8
 
 
-def is_check(game, color):
+def draw_check(game, color):
     """
-    Check if the king of a given color is in check.
+    Highlight a king in check in red, with an arrow from every checking piece.
 
     Args:
         game (Game): The game instance
-        color (int): Color of the king to check
-
-    Returns:
-        bool: True if the king is in check, False otherwise
+        color (int): Color of the king in check
     """
-    pos = king_pos(game.board, color)
+    pos = king_pos(game, color)
+    if pos is None:
+        return
     if game.reverse:
         pos_2 = (7-pos[0], 7-pos[1])
     else:
         pos_2 = (pos[0], pos[1])
-    if pos is None:
-        return False
 
-    # Visual feedback for check
     pos_xy = chess_to_xy(pos_2)
     top_left_x = pos_xy[0] - CASE_SIZE // 2
     top_left_y = pos_xy[1] - CASE_SIZE // 2
-
-    # Check if any opponent piece can attack the king
-    adversaire_color = -color
-    for y in range(8):
-        for x in range(8):
-            piece = game.board[y][x]
-            if piece is not None and piece.color == adversaire_color:
-                if is_legal_move(game, x, y, pos[0], pos[1], True):
-                    # Highlight the king in check
-                    pygame.draw.rect(game.screen, COLOR_CHECK, (top_left_x, top_left_y, CASE_SIZE, CASE_SIZE))
-                    game.update()
-                    if game.reverse:
-                        draw_move_arrow(game.screen, (7-x, 7-y), pos_2)
-                    else:
-                        draw_move_arrow(game.screen, (x, y), pos_2)
-
-                    return True
-    return False
+    pygame.draw.rect(game.screen, COLOR_CHECK, (top_left_x, top_left_y, CASE_SIZE, CASE_SIZE))
+    game.update()
+    for checker in iter_bits(checkers_simu(game.position, color)):
+        x, y = checker % 8, checker // 8
+        if game.reverse:
+            draw_move_arrow(game.screen, (7-x, 7-y), pos_2)
+        else:
+            draw_move_arrow(game.screen, (x, y), pos_2)
 
 
 
@@ -426,28 +260,6 @@ def draw_move_arrow(screen, start_pos, end_pos, color=POSSIBLE_MOVE):
     draw_arrow_filled(screen, color, start_pixel, end_pixel, arrow_width=4, arrow_head_size=12)
 
 
-def is_safe_move(game, original_x, original_y, des_x, des_y, color):
-    """
-    Check if a move is safe (doesn't leave the king in check).
-
-    Args:
-        game (Game): The game instance
-        original_x (int): Origin x coordinate
-        original_y (int): Origin y coordinate
-        des_x (int): Destination x coordinate
-        des_y (int): Destination y coordinate
-        color (int): Color of the player making the move
-
-    Returns:
-        bool: True if the move is safe, False otherwise
-    """
-    # Create a copy of the board and simulate the move
-    game.state = game.copy()
-    move_simu(game.state['board'], original_x, original_y, des_x, des_y)
-    # Check if the king would be in check after the move
-    return not is_check_simu(game.state, color)
-
-
 def is_select(game, event):
     """
     Handle square selection on the chess board and highlight possible moves.
@@ -492,9 +304,9 @@ def is_select(game, event):
                     return des_x, des_y
 
 
-def move(game, original_x, original_y, des_x, des_y,isAi=False):
+def move(game, original_x, original_y, des_x, des_y,isAi=False,promotion_choice=QUEEN):
     """
-    Execute a move on the chess board with full validation and game state updates.
+    Play a move in the game, then show it with its sound.
 
     Args:
         game (Game): The game instance
@@ -502,414 +314,92 @@ def move(game, original_x, original_y, des_x, des_y,isAi=False):
         original_y (int): Origin y coordinate
         des_x (int): Destination x coordinate
         des_y (int): Destination y coordinate
+        isAi (bool): The move is not played by a player, a pawn promotes without asking
+        promotion_choice (int): Piece a pawn promotes to when the player is not asked
 
     Returns:
-        str: Algebraic notation of the move, or None if move is invalid
+        str: Standard algebraic notation of the move, or None if move is invalid
     """
-    # Check if move is legal
-    if not is_legal_move(game, original_x, original_y, des_x, des_y):
+    # The legal moves of the turn were computed once when it started
+    legal_move = game.legal_moves.get((original_x, original_y), {}).get((des_x, des_y))
+    if legal_move is None:
         draw_board(game.screen, game)
+        # A move the piece could make if it did not leave its king in check
+        piece = game.board[original_y][original_x]
+        if piece is not None and piece.color == game.turn and is_legal_move_simu(game.position, original_x, original_y, des_x, des_y):
+            game.move_illegal_sound.play()
         game.update()
         return
 
-    # Check if move is safe (doesn't leave king in check)
-    if not is_safe_move(game, original_x, original_y, des_x, des_y, game.turn):
-        draw_board(game.screen, game)
-        game.move_illegal_sound.play()
-        game.update()
-        return
-
-    capture = False
-    capture_piece = None
-    if game.board[des_y][des_x] is not None:
-        capture = True
-        capture_piece = game.board[des_y][des_x]
-    piece = game.board[original_y][original_x]
-
-    # Handle en passant
-    if can_en_passant(game, original_x, original_y, des_x, des_y):
-        capture = True
-        capture_piece = game.board[original_y][des_x]
-        notation = execute_en_passant(game, original_x, original_y, des_x, des_y)
-        game.capture_sound.play()
-        game.last_move = {
-            'piece_type': PAWN,
-            'from_x': original_x,
-            'from_y': original_y,
-            'to_x': des_x,
-            'to_y': des_y,
-            'en_passant': True,
-            'castle': False,
-            'capture_piece': capture_piece,
-            'promotion': False
-
-        }
-    # Handle castling
-    elif piece.type_piece == KING and (des_x, des_y) == piece.queen_castle and piece.nb_move == 0:
-        notation = execute_castle(game, piece.color, False)
-        game.castle_sound.play()
-        game.last_move = {
-            'piece_type': KING,
-            'from_x': original_x,
-            'from_y': original_y,
-            'to_x': des_x,
-            'to_y': des_y,
-            'en_passant': False,
-            'castle': True,
-            'capture_piece': capture_piece,
-            'promotion': False}
-
-    elif piece.type_piece == KING and (des_x, des_y) == piece.king_castle and piece.nb_move == 0:
-        notation = execute_castle(game, piece.color, True)
-        game.castle_sound.play()
-        game.last_move = {
-            'piece_type': KING,
-            'from_x': original_x,
-            'from_y': original_y,
-            'to_x': des_x,
-            'to_y': des_y,
-            'en_passant': False,
-            'castle': True,
-            'capture_piece': capture_piece,
-            'promotion': False}
-    else:
-        if isAi:
-            promotion = game.board[original_y][original_x].promotion_ai(des_x, des_y)
+    if move_promotion(legal_move):
+        # The player picks the promotion piece, it is given for the AI and the redone moves
+        piece_type = promotion_choice if isAi else game.choose_promotion()
+        legal_move = with_promotion(legal_move, piece_type)
 
-        else:
-            # Execute normal move
-            promotion = game.board[original_y][original_x].promotion(des_x, des_y)
-
-        # Generate algebraic notation
-        notation = algebraic_notation(game, original_x, original_y, des_x, des_y, capture, game.check, game.checkmate,
-                                      piece.type_piece, promotion)
-        # Update board state
-        game.board[des_y][des_x] = piece
-        game.board[original_y][original_x] = None
-        piece.nb_move += 1
-        game.last_move = {
-            'piece_type': piece.type_piece,
-            'from_x': original_x,
-            'from_y': original_y,
-            'to_x': des_x,
-            'to_y': des_y,
-            'en_passant': False,
-            'castle': False,
-            'capture_piece': capture_piece,
-            'promotion': promotion
-        }
-        if promotion:
-            game.update()
-
-
-
-
-    draw_board(game.screen, game)
-
-    # Record the move
-    game.list_move.push(game.last_move)
-
-    # Update game state
+    notation = game.chess.push(legal_move)
     if game.time is not None:
         game.increment(game.turn, game.increment_time)
+    # The board, the turn, its legal moves and the outcome are read back from the game
+    game.observe()
+    game.show_position()
 
-    game.switch_turn()
-    game.check = is_check(game, game.turn)
-    game.what_outcome()
-    game.update()
-
-
-    # Update notation and play sounds
-    if game.checkmate:
-        game.game_end_sound.play()
-        notation += "#"
-    elif game.draw:
+    # Play sounds
+    if game.checkmate or game.draw:
         game.game_end_sound.play()
     elif game.check:
         game.move_check_sound.play()
-        notation += "+"
-    elif capture:
+    elif legal_move & CASTLE_FLAG:
+        game.castle_sound.play()
+    elif legal_move & (CAPTURE_FLAG | EN_PASSANT_FLAG):
         game.capture_sound.play()
     else:
         game.move_self_sound.play()
 
-
-
     return notation
 
 
 def cancel_move(game):
-    last_move = game.list_move.pop()
-    if last_move is None:
+    if game.chess.pop() is None:
         return
-    piece = game.board[last_move['to_y']][last_move['to_x']]
-    piece_eaten = last_move['capture_piece']
-    if last_move['en_passant']:
-        game.board[last_move['from_y']][last_move['from_x']] = piece
-        game.board[last_move['from_y']][last_move['to_x']] = piece_eaten
-        game.board[last_move['to_y']][last_move['to_x']] = None
-    elif last_move['castle']:
-        if last_move['to_x'] == 6:
-            rook = game.board[last_move['from_y']][5]
-            game.board[last_move['from_y']][last_move['from_x']] = piece
-            game.board[last_move['to_y']][last_move['to_x']] = None
-            game.board[last_move['from_y']][5] = None
-            game.board[last_move['from_y']][7] = rook
-
-        else:
-            rook = game.board[last_move['from_y']][3]
-            game.board[last_move['from_y']][last_move['from_x']] = piece
-            game.board[last_move['to_y']][last_move['to_x']] = None
-            game.board[last_move['from_y']][3] = None
-            game.board[last_move['from_y']][0] = rook
-        rook.nb_move -= 1
-    elif last_move['promotion']:
-        piece.demotion()
-        if piece_eaten is not None:
-            game.board[last_move['from_y']][last_move['from_x']] = piece
-            game.board[last_move['to_y']][last_move['to_x']] = piece_eaten
-        else:
-            game.board[last_move['from_y']][last_move['from_x']] = piece
-            game.board[last_move['to_y']][last_move['to_x']] = None
-
-    else:
-        if piece_eaten is not None:
-            game.board[last_move['from_y']][last_move['from_x']] = piece
-            game.board[last_move['to_y']][last_move['to_x']] = piece_eaten
-        else:
-            game.board[last_move['from_y']][last_move['from_x']] = piece
-            game.board[last_move['to_y']][last_move['to_x']] = None
-
-    piece.nb_move -= 1
-    game.last_move = game.list_move.peek()
-    game.switch_turn()
-    draw_board(game.screen, game)
-    game.update()
-
-
-
+    game.observe()
+    game.show_position()
 
-def algebraic_notation( game,original_x,original_y, des_x, des_y, capture, check, checkmate, type_piece,promotion):
-    other = find_other_piece(game,original_x,original_y,type_piece)
-
-    if capture:
-        if promotion:
-            notation = COLUMNS[original_x] + "x" + COLUMNS[des_x] + ROWS[des_y] + "=" + PIECE_PGN[type_piece]
-
-        elif type_piece == PAWN :
-            notation = COLUMNS[original_x] + "x" + COLUMNS[des_x] + ROWS[des_y]
-
-        elif other is not None and is_legal_move(game,other[0],other[1],des_x, des_y):
-            notation = PIECE_PGN[type_piece] + COLUMNS[original_x] + ROWS[original_y] + "x" + COLUMNS[des_x] + ROWS[des_y]
-
-        else:
-            notation = PIECE_PGN[type_piece] + "x" + COLUMNS[des_x] + ROWS[des_y]
 
-
-        return notation
-    else:
-        if promotion:
-            notation = COLUMNS[des_x] + ROWS[des_y] + "=" + PIECE_PGN[type_piece]
-        elif type_piece == PAWN :
-            notation = COLUMNS[des_x] + ROWS[des_y]
-
-        elif other is not None and is_legal_move(game,other[0],other[1],des_x, des_y):
-            notation = PIECE_PGN[type_piece] + COLUMNS[original_x] + ROWS[original_y]  + COLUMNS[des_x] + ROWS[des_y]
-        else:
-            notation = PIECE_PGN[type_piece] + COLUMNS[des_x] + ROWS[des_y]
-
-        return notation
-
-
-def create_pgn(list_coup,color,game):
-    with open("game_save.txt","w") as file:
-        result = ""
-        if color == WHITE and game.checkmate:
-            result = "0-1"
-        elif color == BLACK and game.checkmate:
-            result = "1-0"
-        elif game.draw:
-            result = "1/2-1/2"
-        else:
-            result = "*"
-        file.write(f'[Event ""]\n'
-                   f'[Site ""]\n'
-                   f'[Date ""]\n'
-                   f'[Round ""]\n'
-                   f'[White "Player_1"]\n'
-                   f'[Black "Player_2"]\n'
-                   f'[Result "{result}"]\n'
-                   f'[FEN "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"]\n')
-        for i in range(len(list_coup)):
-            file.write(f"{i+1}. ")
-            for movement in list_coup[i]:
-                file.write(f"{movement} ")
-        file.write(result)
-
-
-def can_castle_king_side(game, color):
+def redo_move(game):
     """
-    Vérify if the king side castle is possible
-    """
-    king_x, king_row = king_pos(game.board,color)
-    rook_x = 7
-
-    # We verify is the king and the rook didn't move
+    Play again the last cancelled move, with the piece it promoted to.
 
-    king = game.board[king_row][king_x]
-    rook = game.board[king_row][rook_x]
-
-    if  king.color != color or king.nb_move > 0:
-        return False
-    if rook is None or rook.type_piece != ROOK or rook.color != color or rook.nb_move > 0:
-        return False
-
-    # Check that the squares between the king and the rook are empty
-    for x in range(5, 7):
-        if game.board[king_row][x] is not None:
-            return False
-
-    # Check that the king is not in check and does not pass through an attacked square.
-    if game.check:
-        return False
-
-    # Simulate the king's movement square by square
-    for x in range(4, 7):
-        if not is_safe_move(game, king_x, king_row, x, king_row, color):
-            return False
-
-    return True
-
-
-def can_castle_queen_side(game, color):
-    """
-    Vérify if the king side castle is possible
+    Returns:
+        str: Algebraic notation of the move, or None if there is no move to redo
     """
-    king_x, king_row = king_pos(game.board,color)
-    rook_x =  0
-
-    # We verify if the king and the rook didn't move
+    redone = game.chess.next_move()
+    if redone is None:
+        return None
+    promotion_choice = move_promotion(redone) or QUEEN
+    return move(game, *move_coordinates(redone), isAi=True, promotion_choice=promotion_choice)
 
-    king = game.board[king_row][king_x]
-    rook = game.board[king_row][rook_x]
 
-    if  king.color != color or king.nb_move > 0:
-        return False
-    if rook is None or rook.type_piece != ROOK or rook.color != color or rook.nb_move > 0:
-        return False
-
-    # Check that the squares between the king and the rook are empty
-
-    for x in range(1, 4):
-        if game.board[king_row][x] is not None:
-            return False
-
-    # Check that the king is not in check and does not pass through an attacked square.
-
-    if game.check:
-        return False
-
-    # Simulate the king's movement square by square
-
-    for x in range(4, 1, -1):
-        if not is_safe_move(game, king_x, king_row, x, king_row, color):
-            return False
+def go_to_ply(game, ply):
+    """
+    Show the game after the given number of halfmoves, the moves after it can still be redone.
 
-    return True
+    Args:
+        game (Game): The game instance
+        ply (int): Number of halfmoves from the start of the game, limited to the moves known
+    """
+    game.chess.go_to_ply(ply)
+    game.observe()
+    game.show_position()
 
 
-def execute_castle(game, color, king_side=True):
+def create_pgn(game):
     """
-    Exécute le roque
+    Save the game in game_save.txt. A player who ran out of time loses it.
     """
-    king_row = 7 if color == WHITE else 0
-
-    if king_side:
-        # Roque côté roi
-        king_new_x, rook_old_x, rook_new_x = 6, 7, 5
-    else:
-        # Roque côté dame
-        king_new_x, rook_old_x, rook_new_x = 2, 0, 3
-
-    # Déplacer le roi
-    king = game.board[king_row][4]
-    game.board[king_row][king_new_x] = king
-    game.board[king_row][4] = None
-    king.nb_move += 1
-
-    # Déplacer la tour
-    rook = game.board[king_row][rook_old_x]
-    game.board[king_row][rook_new_x] = rook
-    game.board[king_row][rook_old_x] = None
-    rook.nb_move += 1
-
-    return "O-O" if king_side else "O-O-O"
-
-def can_en_passant(game,orig_x,orig_y,des_x,des_y):
-    pawn = game.board[orig_y][orig_x]
-    if pawn is None or pawn.type_piece != PAWN:
-        return False
-    color = pawn.color
-    if (color == WHITE and pawn.y != 3) or (color == BLACK and pawn.y != 4):
-        return False
-    dx = des_x - orig_x
-    dy = des_y - orig_y
-
-    if (dx,dy) not in pawn.movement_2:
-        return False
-
-    adjacent_pawn = game.board[orig_y][des_x]
-    if adjacent_pawn is None or adjacent_pawn.type_piece != PAWN or adjacent_pawn.color == color:
-        return False
-
-    if game.last_move is None:
-        return False
-
-    if (game.last_move["piece_type"] == PAWN and
-        game.last_move["to_x"] == des_x and
-        game.last_move["to_y"] == orig_y and
-        abs(game.last_move['from_y'] - game.last_move['to_y']) == 2):
-        return True
-    return False
-
-def execute_en_passant(game,orig_x,orig_y,des_x,des_y):
-    pawn = game.board[orig_y][orig_x]
-    pawn.nb_move += 1
-    game.board[orig_y][des_x] = None
-    game.board[des_y][des_x] = pawn
-    game.board[orig_y][orig_x] = None
-    return f"{COLUMNS[orig_x]}x{COLUMNS[des_x]}{ROWS[des_y]}"
-
-
-def find_other_piece(game,orig_x,orig_y,type_piece):
-    for y in range(8):
-        for x in range(8):
-            if game.board[y][x] is not None:
-                if game.board[y][x].type_piece == type_piece and (x,y) != (orig_x,orig_y) and game.board[y][x].color == game.board[orig_y][orig_x].color:
-                    return x,y
-    return
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+    result = None
+    if game.time is not None and game.white_time < 1:
+        result = "0-1"
+    elif game.time is not None and game.black_time < 1:
+        result = "1-0"
+    with open("game_save.txt","w") as file:
+        file.write(game.chess.pgn(result))
@@ -0,0 +1,98 @@
+# moves.py - Compact integer encoding of the moves
+
+from utils.constante import *
+
+# A move is a single int:
+#   bits 0-5    origin square (y * 8 + x)
+#   bits 6-11   destination square
+#   bits 12-14  type of the promotion piece, EMPTY when the move is not a promotion
+#   bits 15-17  flags
+MOVE_SQUARE_MASK = 0x3F
+MOVE_TO_SHIFT = 6
+MOVE_PROMOTION_SHIFT = 12
+MOVE_PROMOTION_MASK = 0x7
+CAPTURE_FLAG = 1 << 15
+CASTLE_FLAG = 1 << 16
+EN_PASSANT_FLAG = 1 << 17
+
+NO_MOVE = 0    # a8 to a8, never a legal move
+
+
+def encode_move(origin, destination, promotion=EMPTY, flags=0):
+    """
+    Pack a move into an int.
+
+    Args:
+        origin (int): Square of the moving piece
+        destination (int): Destination square
+        promotion (int): Type of the promotion piece, EMPTY if none
+        flags (int): CAPTURE_FLAG, CASTLE_FLAG and EN_PASSANT_FLAG combined
+
+    Returns:
+        int: The encoded move
+    """
+    return origin | (destination << MOVE_TO_SHIFT) | (promotion << MOVE_PROMOTION_SHIFT) | flags
+
+
+def decode_move(move):
+    """
+    Unpack an encoded move.
+
+    Args:
+        move (int): The encoded move
+
+    Returns:
+        tuple: (origin, destination, promotion, flags)
+    """
+    return (move & MOVE_SQUARE_MASK,
+            (move >> MOVE_TO_SHIFT) & MOVE_SQUARE_MASK,
+            (move >> MOVE_PROMOTION_SHIFT) & MOVE_PROMOTION_MASK,
+            move & (CAPTURE_FLAG | CASTLE_FLAG | EN_PASSANT_FLAG))
+
+
+def move_from(move):
+    return move & MOVE_SQUARE_MASK
+
+
+def move_to(move):
+    return (move >> MOVE_TO_SHIFT) & MOVE_SQUARE_MASK
+
+
+def move_promotion(move):
+    return (move >> MOVE_PROMOTION_SHIFT) & MOVE_PROMOTION_MASK
+
+
+def is_quiet_move(move):
+    """
+    A quiet move is neither a capture (en passant included) nor a promotion.
+    """
+    return not move & (CAPTURE_FLAG | EN_PASSANT_FLAG | (MOVE_PROMOTION_MASK << MOVE_PROMOTION_SHIFT))
+
+
+def move_coordinates(move):
+    """
+    Board coordinates of a move, as used by the game and the interface.
+
+    Args:
+        move (int): The encoded move
+
+    Returns:
+        tuple: (o_x, o_y, d_x, d_y)
+    """
+    origin = move & MOVE_SQUARE_MASK
+    destination = (move >> MOVE_TO_SHIFT) & MOVE_SQUARE_MASK
+    return origin % 8, origin // 8, destination % 8, destination // 8
+
+
+def with_promotion(move, promotion):
+    """
+    Same move with another promotion piece.
+
+    Args:
+        move (int): The encoded move
+        promotion (int): Type of the promotion piece, EMPTY if none
+
+    Returns:
+        int: The encoded move
+    """
+    return (move & ~(MOVE_PROMOTION_MASK << MOVE_PROMOTION_SHIFT)) | (promotion << MOVE_PROMOTION_SHIFT)
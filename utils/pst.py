@@ -0,0 +1,123 @@
+# pst.py - Piece-square tables of the evaluation, flattened for the incremental scores of Position
+
+from utils.constante import *
+
+# --- POSITIONAL EVALUATION TABLES (PST) ---
+# These tables define where pieces prefer to be (from WHITE's perspective).
+# The Y index is inverted for Black.
+# Values are small to avoid exceeding the value of a pawn (often 10 or 100).
+
+# Pawns want to advance (Y=0 is the top of the screen, promotion for White)
+PAWN_TABLE = [
+    [0,  0,  0,  0,  0,  0,  0,  0],
+    [50, 50, 50, 50, 50, 50, 50, 50],
+    [10, 10, 20, 30, 30, 20, 10, 10],
+    [5,  5, 10, 25, 25, 10,  5,  5],
+    [0,  0,  0, 20, 20,  0,  0,  0],
+    [5, -5,-10,  0,  0,-10, -5,  5],
+    [5, 10, 10,-20,-20, 10, 10,  5],
+    [0,  0,  0,  0,  0,  0,  0,  0]
+]
+
+KNIGHT_TABLE = [
+    [-50,-40,-30,-30,-30,-30,-40,-50],
+    [-40,-20,  0,  0,  0,  0,-20,-40],
+    [-30,  0, 10, 15, 15, 10,  0,-30],
+    [-30,  5, 15, 20, 20, 15,  5,-30],
+    [-30,  0, 15, 20, 20, 15,  0,-30],
+    [-30,  5, 10, 15, 15, 10,  5,-30],
+    [-40,-20,  0,  5,  5,  0,-20,-40],
+    [-50,-40,-30,-30,-30,-30,-40,-50]
+]
+
+BISHOP_TABLE = [
+    [-20,-10,-10,-10,-10,-10,-10,-20],
+    [-10,  0,  0,  0,  0,  0,  0,-10],
+    [-10,  0,  5, 10, 10,  5,  0,-10],
+    [-10,  5,  5, 10, 10,  5,  5,-10],
+    [-10,  0, 10, 10, 10, 10,  0,-10],
+    [-10, 10, 10, 10, 10, 10, 10,-10],
+    [-10,  5,  0,  0,  0,  0,  5,-10],
+    [-20,-10,-10,-10,-10,-10,-10,-20]
+]
+
+ROOK_TABLE = [
+    [0,  0,  0,  0,  0,  0,  0,  0],
+    [5, 10, 10, 10, 10, 10, 10,  5],
+    [-5,  0,  0,  0,  0,  0,  0, -5],
+    [-5,  0,  0,  0,  0,  0,  0, -5],
+    [-5,  0,  0,  0,  0,  0,  0, -5],
+    [-5,  0,  0,  0,  0,  0,  0, -5],
+    [-5,  0,  0,  0,  0,  0,  0, -5],
+    [0,  0,  0,  5,  5,  0,  0,  0]
+]
+
+QUEEN_TABLE = [
+    [-20,-10,-10, -5, -5,-10,-10,-20],
+    [-10,  0,  0,  0,  0,  0,  0,-10],
+    [-10,  0,  5,  5,  5,  5,  0,-10],
+    [-5,  0,  5,  5,  5,  5,  0, -5],
+    [0,  0,  5,  5,  5,  5,  0, -5],
+    [-10,  5,  5,  5,  5,  5,  0,-10],
+    [-10,  0,  5,  0,  0,  0,  0,-10],
+    [-20,-10,-10, -5, -5,-10,-10,-20]
+]
+
+KING_MIDDLE_GAME_TABLE = [
+    [-30,-40,-40,-50,-50,-40,-40,-30],
+    [-30,-40,-40,-50,-50,-40,-40,-30],
+    [-30,-40,-40,-50,-50,-40,-40,-30],
+    [-30,-40,-40,-50,-50,-40,-40,-30],
+    [-20,-30,-30,-40,-40,-30,-30,-20],
+    [-10,-20,-20,-20,-20,-20,-20,-10],
+    [20, 20,  0,  0,  0,  0, 20, 20],
+    [20, 30, 10,  0,  0, 10, 30, 20]
+]
+
+KING_END_GAME_TABLE = [
+    [-50,-40,-30,-20,-20,-30,-40,-50],
+    [-30,-20,-10,  0,  0,-10,-20,-30],
+    [-30,-10, 20, 30, 30, 20,-10,-30],
+    [-30,-10, 30, 40, 40, 30,-10,-30],
+    [-30,-10, 30, 40, 40, 30,-10,-30],
+    [-30,-10, 20, 30, 30, 20,-10,-30],
+    [-30,-30,  0,  0,  0,  0,-30,-30],
+    [-50,-30,-30,-30,-30,-30,-30,-50]
+]
+
+
+# Weight of the pieces in the game phase, from MAX_PHASE (every piece on the board) to 0 (kings and pawns)
+PHASE_WEIGHT = [0, 0, 2, 1, 1, 4, 0]
+MAX_PHASE = 24
+ENDGAME_PHASE = 6    # At most a queen and a minor piece, or a rook and two minor pieces, left
+
+
+def _flatten(table, color, piece_type):
+    """
+    Turn a table seen from White into a list indexed by square for one color.
+    The piece value is included and the score is signed: positive for White, negative for Black.
+    """
+    value = PIECE_VALUE[piece_type] if piece_type != KING else 0
+    flat = []
+    for sq in range(64):
+        x, y = sq % 8, sq // 8
+        if color == BLACK:
+            y = 7 - y
+        flat.append(color * (value + table[y][x]))
+    return flat
+
+
+def _color_tables(king_table):
+    tables = {PAWN: PAWN_TABLE, ROOK: ROOK_TABLE, KNIGHT: KNIGHT_TABLE, BISHOP: BISHOP_TABLE,
+              QUEEN: QUEEN_TABLE, KING: king_table}
+    by_color = [None, None, None]
+    for color in (WHITE, BLACK):
+        by_color[color] = [[0] * 64] + [_flatten(tables[piece_type], color, piece_type)
+                                        for piece_type in (PAWN, ROOK, KNIGHT, BISHOP, QUEEN, KING)]
+    return by_color
+
+
+# PST_MG[color][piece_type][square]: material + middlegame position, signed for the color
+PST_MG = _color_tables(KING_MIDDLE_GAME_TABLE)
+# PST_EG[color][piece_type][square]: material + endgame position, signed for the color
+PST_EG = _color_tables(KING_END_GAME_TABLE)
@@ -0,0 +1,512 @@
+# rules.py - Rules of chess over the bitboard position, shared by the game and the AI
+
+from utils.constante import *
+from utils.bitboard import *
+from utils.moves import *
+from classes.position import *
+
+
+def is_legal_move_simu(state, o_x, o_y, d_x, d_y):
+    """
+    Check if a move is legal in a simulated board state (used for move validation).
+
+    Args:
+        state (Position): The simulated position
+        o_x (int): Origin x coordinate
+        o_y (int): Origin y coordinate
+        d_x (int): Destination x coordinate
+        d_y (int): Destination y coordinate
+
+    Returns:
+        bool: True if the move is legal, False otherwise
+    """
+    origin = square(o_x, o_y)
+    destination = square(d_x, d_y)
+    code = state.squares[origin]
+    if code == EMPTY:
+        return False
+    color = WHITE if code > 0 else BLACK
+    piece_type = code * color
+
+    # Cannot capture own piece
+    if state.occupancy[color] & SQUARE_BB[destination]:
+        return False
+
+    if piece_type == PAWN:
+        return is_legal_move_pawn_simu(state, o_x, o_y, d_x, d_y)
+
+    if piece_type == KING and o_y == d_y and abs(d_x - o_x) == 2:
+        if (d_x, d_y) in KING_SIDE_CASTLE:
+            return can_castle_king_side_simu(state, color)
+        return can_castle_queen_side_simu(state, color)
+
+    return piece_attacks(piece_type, origin, state.occupied()) & SQUARE_BB[destination] != 0
+
+
+def is_legal_move_pawn_simu(state, o_x, o_y, d_x, d_y):
+    """
+    Check if a pawn move is legal in a simulated board state.
+
+    Args:
+        state (Position): The simulated position
+        o_x (int): Origin x coordinate
+        o_y (int): Origin y coordinate
+        d_x (int): Destination x coordinate
+        d_y (int): Destination y coordinate
+
+    Returns:
+        bool: True if the pawn move is legal, False otherwise
+    """
+    origin = square(o_x, o_y)
+    destination = square(d_x, d_y)
+    color = WHITE if state.squares[origin] > 0 else BLACK
+    occupied = state.occupied()
+
+    # Diagonal captures, en passant included
+    if PAWN_ATTACKS[color][origin] & SQUARE_BB[destination]:
+        return state.occupancy[-color] & SQUARE_BB[destination] != 0 or destination == state.ep_square
+
+    # Forward moves only go to empty squares
+    forward = -8 if color == WHITE else 8
+    if occupied & SQUARE_BB[destination]:
+        return False
+    if destination == origin + forward:
+        return True
+    start_row = 6 if color == WHITE else 1
+    if o_y == start_row and destination == origin + 2 * forward:
+        return not occupied & SQUARE_BB[origin + forward]
+    return False
+
+
+def is_safe_move_simu(state, original_x, original_y, des_x, des_y, color):
+    if (original_x, original_y) == (des_x, des_y):
+        return not is_check_simu(state, color)
+    # Play the move in place and take it back once the king has been checked
+    undo = state.make_move(state.build_move(square(original_x, original_y), square(des_x, des_y)))
+    safe = not is_check_simu(state, color)
+    state.unmake_move(undo)
+    return safe
+
+
+def check_info(state, color):
+    """
+    Checkers and pinned pieces of a color, computed once for all the moves of a position.
+
+    Args:
+        state (Position): The simulated position
+        color (int): Color of the side to move
+
+    Returns:
+        tuple: (king square or None, bitboard of the checkers, bitboard of the pinned pieces,
+                dict giving for every pinned piece the squares it can move to along its pin)
+    """
+    king = state.king_square(color)
+    if king is None:
+        return None, 0, 0, {}
+    checkers = checkers_simu(state, color)
+
+    pinned = 0
+    pin_rays = {}
+    enemy = state.pieces[-color]
+    occupied = state.occupied()
+    # Enemy sliders that would attack the king on an empty board
+    snipers = ((rook_attacks(king, 0) & (enemy[ROOK] | enemy[QUEEN]))
+               | (bishop_attacks(king, 0) & (enemy[BISHOP] | enemy[QUEEN])))
+    for sniper in iter_bits(snipers):
+        blockers = BETWEEN[king][sniper] & occupied
+        # Pinned when exactly one piece stands in between and it is ours
+        if blockers and not blockers & (blockers - 1) and blockers & state.occupancy[color]:
+            pinned |= blockers
+            pin_rays[lsb(blockers)] = BETWEEN[king][sniper] | SQUARE_BB[sniper]
+    return king, checkers, pinned, pin_rays
+
+
+def is_legal_simu(state, info, origin, destination, color):
+    """
+    Check that a pseudo legal move does not leave the king in check, without playing it.
+
+    King moves are checked against the attacks on the destination square, the other moves
+    against the checkers and pins of the position. Castling and en passant, which move two
+    pieces, are still played and taken back.
+
+    Args:
+        state (Position): The simulated position
+        info (tuple): Result of check_info for this position and color
+        origin (int): Square of the moving piece
+        destination (int): Destination square
+        color (int): Color of the moving piece
+
+    Returns:
+        bool: True if the move is legal, False otherwise
+    """
+    king, checkers, pinned, pin_rays = info
+    if king is None:
+        return True
+    piece_type = state.squares[origin] * color
+    if piece_type == KING:
+        if destination - origin in (2, -2):
+            return is_safe_move_simu(state, origin % 8, origin // 8, destination % 8, destination // 8, color)
+        # The king no longer shields the squares behind it from the sliders
+        return not state.attackers(destination, -color, state.occupied() ^ SQUARE_BB[origin])
+    if piece_type == PAWN and destination == state.ep_square:
+        return is_safe_move_simu(state, origin % 8, origin // 8, destination % 8, destination // 8, color)
+    if checkers:
+        # Only the king can escape a double check, otherwise capture or block the checker
+        if checkers & (checkers - 1):
+            return False
+        if not SQUARE_BB[destination] & (checkers | BETWEEN[king][lsb(checkers)]):
+            return False
+    if pinned & SQUARE_BB[origin]:
+        return pin_rays[origin] & SQUARE_BB[destination] != 0
+    return True
+
+
+def checkers_simu(state, color):
+    """
+    Enemy pieces giving check in a simulated board state.
+    The king square is read from its bitboard, then the attack patterns are applied from it.
+
+    Args:
+        state (Position): The simulated position
+        color (int): Color of the king we are checking
+
+    Returns:
+        int: Bitboard of the checking pieces, 0 if the king is not in check
+    """
+    pos = state.king_square(color)
+    if pos is None:
+        return 0
+    return state.attackers(pos, -color)
+
+
+def is_check_simu(state, color):
+    """
+    Check if the king is in check in a simulated board state.
+
+    Args:
+        state (Position): The simulated position
+        color (int): Color of the king we are checking
+
+    Returns:
+        bool: True if the king is in check, False otherwise
+    """
+    return checkers_simu(state, color) != 0
+
+
+def threefold_repetition_simu(state):
+    # The position counts are kept up to date by make_move and unmake_move
+    return state.hash_counts.get(state.hash, 0) >= REPETITION_LIMIT
+
+
+def fifty_move_simu(state):
+    return state.halfmove >= FIFTY_MOVE_LIMIT
+
+
+def game_status_simu(state):
+    """
+    Status of the game for the side to move, cheap enough to be called on every leaf.
+
+    The check comes from the attack maps of the king square, the material key tells
+    insufficient material and the legal move test stops at the first legal move.
+
+    Args:
+        state (Position): The simulated position
+
+    Returns:
+        int: GAME_IN_PROGRESS, CHECK, WHITE_CHECKMATE/BLACK_CHECKMATE (the side mated),
+             STALEMATE, INSUFFICIENT, THREEFOLD or FIFTY_MOVES
+    """
+    color = state.turn
+    if is_check_simu(state, color):
+        if has_legal_move(state, color):
+            return CHECK
+        return WHITE_CHECKMATE if color == WHITE else BLACK_CHECKMATE
+    if state.has_insufficient_material():
+        return INSUFFICIENT
+    if threefold_repetition_simu(state):
+        return THREEFOLD
+    if fifty_move_simu(state):
+        return FIFTY_MOVES
+    if not has_legal_move(state, color):
+        return STALEMATE
+    return GAME_IN_PROGRESS
+
+
+def can_castle_king_side_simu(state, color):
+    """
+    Vérify if the king side castle is possible
+    """
+    king_row = 7 if color == WHITE else 0
+    right = WHITE_KING_SIDE if color == WHITE else BLACK_KING_SIDE
+    if not state.castling & right:
+        return False
+
+    # Check that the squares between the king and the rook are empty
+    king = square(4, king_row)
+    if state.occupied() & BETWEEN[king][square(7, king_row)]:
+        return False
+
+    # Check that the king is not in check and does not pass through an attacked square.
+    target = square(6, king_row)
+    for sq in iter_bits(SQUARE_BB[king] | BETWEEN[king][target] | SQUARE_BB[target]):
+        if state.is_attacked(sq, -color):
+            return False
+
+    return True
+
+
+def can_castle_queen_side_simu(state, color):
+    """
+    Vérify if the king side castle is possible
+    """
+    king_row = 7 if color == WHITE else 0
+    right = WHITE_QUEEN_SIDE if color == WHITE else BLACK_QUEEN_SIDE
+    if not state.castling & right:
+        return False
+
+    # Check that the squares between the king and the rook are empty
+    king = square(4, king_row)
+    if state.occupied() & BETWEEN[king][square(0, king_row)]:
+        return False
+
+    # Check that the king is not in check and does not pass through an attacked square.
+    target = square(2, king_row)
+    for sq in iter_bits(SQUARE_BB[king] | BETWEEN[king][target] | SQUARE_BB[target]):
+        if state.is_attacked(sq, -color):
+            return False
+
+    return True
+
+
+def pawn_targets(state, origin, color, occupied):
+    """
+    Squares a pawn can reach: pushes, captures and the en passant square.
+
+    Args:
+        state (Position): The simulated position
+        origin (int): Square of the pawn
+        color (int): Color of the pawn
+        occupied (int): Bitboard of every occupied square
+
+    Returns:
+        int: Bitboard of the destination squares
+    """
+    attacks = PAWN_ATTACKS[color][origin]
+    targets = attacks & state.occupancy[-color]
+    if state.ep_square is not None and color == state.turn and attacks & SQUARE_BB[state.ep_square]:
+        targets |= SQUARE_BB[state.ep_square]
+
+    forward = -8 if color == WHITE else 8
+    one_step = origin + forward
+    if 0 <= one_step < 64 and not occupied & SQUARE_BB[one_step]:
+        targets |= SQUARE_BB[one_step]
+        start_row = 6 if color == WHITE else 1
+        if origin // 8 == start_row and not occupied & SQUARE_BB[one_step + forward]:
+            targets |= SQUARE_BB[one_step + forward]
+    return targets
+
+
+def iter_legal_moves(state, color):
+    """
+    Yield the legal moves of a color one by one.
+    Each piece only visits the squares it can reach, king safety is then checked move by move.
+
+    Args:
+        state (Position): The simulated position
+        color (int): Color of the side to generate moves for
+
+    Yields:
+        int: The encoded move
+    """
+    info = check_info(state, color)
+    if info[1]:
+        yield from iter_evasions(state, color, info)
+        return
+    own = state.occupancy[color]
+    occupied = own | state.occupancy[-color]
+    for origin in iter_bits(own):
+        piece_type = state.squares[origin] * color
+        if piece_type == PAWN:
+            targets = pawn_targets(state, origin, color, occupied)
+        else:
+            targets = piece_attacks(piece_type, origin, occupied) & ~own
+        for destination in iter_bits(targets):
+            if is_legal_simu(state, info, origin, destination, color):
+                yield state.build_move(origin, destination)
+
+    # Castling is the only move that goes beyond the king attack table
+    king = info[0]
+    if can_castle_king_side_simu(state, color):
+        yield encode_move(king, king + 2, EMPTY, CASTLE_FLAG)
+    if can_castle_queen_side_simu(state, color):
+        yield encode_move(king, king - 2, EMPTY, CASTLE_FLAG)
+
+
+def iter_evasions(state, color, info):
+    """
+    Yield the legal moves of a color in check: king moves, then captures of the checker
+    and interpositions on its ray. Only the king can move out of a double check.
+
+    Args:
+        state (Position): The simulated position
+        color (int): Color of the side in check
+        info (tuple): Result of check_info for this position and color
+
+    Yields:
+        int: The encoded move
+    """
+    king, checkers, pinned, pin_rays = info
+    own = state.occupancy[color]
+    occupied = own | state.occupancy[-color]
+
+    without_king = occupied ^ SQUARE_BB[king]
+    for destination in iter_bits(KING_ATTACKS[king] & ~own):
+        if not state.attackers(destination, -color, without_king):
+            yield state.build_move(king, destination)
+
+    if checkers & (checkers - 1):
+        return
+    checker = lsb(checkers)
+    block = checkers | BETWEEN[king][checker]
+    # A pawn that just made a double step can also be taken en passant
+    ep_block = block
+    if state.ep_square is not None and abs(state.squares[checker]) == PAWN:
+        ep_block |= SQUARE_BB[state.ep_square]
+
+    for origin in iter_bits(own & ~SQUARE_BB[king]):
+        piece_type = state.squares[origin] * color
+        if piece_type == PAWN:
+            targets = pawn_targets(state, origin, color, occupied) & ep_block
+        else:
+            targets = piece_attacks(piece_type, origin, occupied) & block
+        if not targets:
+            continue
+        for destination in iter_bits(targets):
+            if is_legal_simu(state, info, origin, destination, color):
+                yield state.build_move(origin, destination)
+
+
+def generate_legal_moves(state, color: int) -> list:
+    """
+    Generate every legal move of a color.
+
+    Args:
+        state (Position): The simulated position
+        color (int): Color of the side to generate moves for
+
+    Returns:
+        list: Encoded moves
+    """
+    return list(iter_legal_moves(state, color))
+
+
+def has_legal_move(state, color):
+    """
+    Tell whether a color has at least one legal move, stopping at the first one found.
+    """
+    return next(iter_legal_moves(state, color), None) is not None
+
+
+def generate_captures(state, color, info=None):
+    """
+    Generate the legal captures and promotions of a color, used by the quiescence search.
+
+    Args:
+        state (Position): The simulated position
+        color (int): Color of the side to generate moves for
+        info (tuple): Result of check_info, computed when not given
+
+    Returns:
+        list: Encoded moves
+    """
+    captures = []
+    if info is None:
+        info = check_info(state, color)
+    own = state.occupancy[color]
+    enemy = state.occupancy[-color]
+    occupied = own | enemy
+    for origin in iter_bits(own):
+        piece_type = state.squares[origin] * color
+        if piece_type == PAWN:
+            targets = enemy | BACK_RANKS
+            if state.ep_square is not None:
+                targets |= SQUARE_BB[state.ep_square]
+            targets &= pawn_targets(state, origin, color, occupied)
+        else:
+            targets = piece_attacks(piece_type, origin, occupied) & enemy
+        for destination in iter_bits(targets):
+            if is_legal_simu(state, info, origin, destination, color):
+                captures.append(state.build_move(origin, destination))
+    return captures
+
+
+def generate_quiet_moves(state, color, info):
+    """
+    Generate the legal moves of a color that are neither captures nor promotions, castling included.
+    Together with generate_captures it gives every legal move of a position not in check.
+
+    Args:
+        state (Position): The simulated position
+        color (int): Color of the side to generate moves for
+        info (tuple): Result of check_info for this position and color
+
+    Returns:
+        list: Encoded moves
+    """
+    quiets = []
+    own = state.occupancy[color]
+    occupied = own | state.occupancy[-color]
+    for origin in iter_bits(own):
+        piece_type = state.squares[origin] * color
+        if piece_type == PAWN:
+            # Pushes only, the promotions are searched with the captures
+            targets = pawn_targets(state, origin, color, occupied) & ~occupied & ~BACK_RANKS
+            if state.ep_square is not None:
+                targets &= ~SQUARE_BB[state.ep_square]
+        else:
+            targets = piece_attacks(piece_type, origin, occupied) & ~occupied
+        for destination in iter_bits(targets):
+            if is_legal_simu(state, info, origin, destination, color):
+                quiets.append(encode_move(origin, destination))
+
+    king = info[0]
+    if can_castle_king_side_simu(state, color):
+        quiets.append(encode_move(king, king + 2, EMPTY, CASTLE_FLAG))
+    if can_castle_queen_side_simu(state, color):
+        quiets.append(encode_move(king, king - 2, EMPTY, CASTLE_FLAG))
+    return quiets
+
+
+def is_valid_move_simu(state, info, move, color):
+    """
+    Check that a move remembered from another position (hash move, killer move) is legal here.
+
+    Args:
+        state (Position): The simulated position
+        info (tuple): Result of check_info for this position and color
+        move (int): The encoded move
+        color (int): Color of the side to move
+
+    Returns:
+        bool: True if the move is legal in this position
+    """
+    origin = move & MOVE_SQUARE_MASK
+    destination = (move >> MOVE_TO_SHIFT) & MOVE_SQUARE_MASK
+    piece_type = state.squares[origin] * color
+    if piece_type <= 0:
+        return False
+    own = state.occupancy[color]
+    occupied = own | state.occupancy[-color]
+    if piece_type == PAWN:
+        targets = pawn_targets(state, origin, color, occupied)
+    else:
+        targets = piece_attacks(piece_type, origin, occupied) & ~own
+    if targets & SQUARE_BB[destination]:
+        # The flags must also match: a capture remembered as a quiet move is another move here
+        return move == state.build_move(origin, destination) and is_legal_simu(state, info, origin, destination, color)
+    if move == encode_move(origin, destination, EMPTY, CASTLE_FLAG) and piece_type == KING:
+        if destination == origin + 2:
+            return can_castle_king_side_simu(state, color)
+        if destination == origin - 2:
+            return can_castle_queen_side_simu(state, color)
+    return False